@@ -1,5 +1,15 @@
+from typing import Any, Callable, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, SessionLocal
+
+
+# what `get_session` yields, depending on `settings.db_async`
+DbSession = Union[AsyncSession, Session]
 
 
 def get_db():
@@ -7,4 +17,39 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_session():
+    """
+    AsyncSession when `settings.db_async` is on, otherwise the sync
+    Session. Routes pass it to services through `run_db`.
+    """
+    if settings.db_async:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db: Session = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def run_db(db: DbSession, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a session-first service function `fn(db, *args, **kwargs)`.
+
+    - AsyncSession: runs on the event loop via `run_sync`; the asyncpg
+      driver awaits I/O underneath, so no threadpool slot is held
+    - Session: runs in the threadpool as a sync route would
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -1,12 +1,63 @@
+import os
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str | None = None  # defaults to DATABASE_URL via asyncpg
     SECRET_KEY: str
     access_token_expire_minutes: int = 60
 
+    # Database access for request handlers
+    db_async: bool = True  # False: sync sessions in the threadpool
+    db_async_pool_size: int = 20
+    db_async_max_overflow: int = 20
+
+    # Audit pipeline
+    audit_queue_max_size: int = 10000
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 1.0
+    audit_sample_rate: float = 1.0  # applies to read-only requests only
+    audit_excluded_paths: list[str] = ["/metrics", "/docs", "/redoc", "/openapi.json"]
+    audit_partition_months_ahead: int = 3
+    audit_retention_months: int = 12
+    audit_archive_dir: str = "archive/audit"
+
+    # Principal cache (authenticated user snapshots)
+    principal_cache_max_size: int = 10000
+    principal_cache_ttl_seconds: float = 60.0
+    revoked_token_versions_max_size: int = 100000
+    invalidation_backend: str = "local"  # local | redis (shared across workers)
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Password hashing (bcrypt_sha256 in a process pool)
+    password_hash_rounds: int = 12
+    password_hash_workers: int = max(1, os.cpu_count() or 1)
+    password_hash_max_pending: int = 64
+
+    # Recurring availability schedules
+    availability_schedule_max_days: int = 92
+    availability_schedule_max_slots: int = 5000
+
+    # In-memory availability bitmap (per doctor per UTC day)
+    availability_index_max_days: int = 100000
+    availability_index_ttl_seconds: float = 300.0
+    availability_index_horizon_days: int = 30  # how far next-free looks ahead
+
+    # Booking slot lock: blocking | nowait | advisory (the latter two
+    # answer 409 immediately instead of queueing behind a hot slot)
+    booking_lock_strategy: str = "blocking"
+
+    # Rate limiting
+    rate_limit_backend: str = "memory"  # memory | redis (shared across workers)
+    rate_limit_policies: dict[str, str] = {
+        "signup": "3/minute",
+        "login": "5/minute",
+        "bookings": "30/minute",
+        "payments": "20/minute",
+    }
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,93 @@
+"""
+Cross-worker cache invalidation.
+
+Every uvicorn worker keeps its own in-process caches. When shared state
+changes, the worker that made the change publishes `(topic, key)` on the
+bus and every subscribed worker evicts its local copy.
+
+- `LocalInvalidationBus`: in-process stand-in (single worker, tests)
+- `RedisInvalidationBus`: Redis pub/sub, consistent across workers
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Callable
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+Subscriber = Callable[[str], None]
+
+
+class LocalInvalidationBus:
+    def __init__(self):
+        self._subscribers: dict[str, list[Subscriber]] = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: Subscriber):
+        self._subscribers[topic].append(callback)
+
+    def publish(self, topic: str, key: str):
+        self._dispatch(topic, key)
+
+    def _dispatch(self, topic: str, key: str):
+        for callback in self._subscribers.get(topic, []):
+            try:
+                callback(key)
+            except Exception:
+                logger.exception("Invalidation subscriber failed for %s", topic)
+
+
+class RedisInvalidationBus(LocalInvalidationBus):
+    CHANNEL = "telemedicine:invalidations"
+
+    def __init__(self, url: str):
+        super().__init__()
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._listener = threading.Thread(
+            target=self._listen,
+            name="invalidation-listener",
+            daemon=True,
+        )
+        self._listener.start()
+
+    def publish(self, topic: str, key: str):
+        # evict locally right away; the echo from Redis is harmless
+        self._dispatch(topic, key)
+
+        try:
+            self._client.publish(self.CHANNEL, json.dumps([topic, key]))
+        except Exception:
+            # other workers converge when their TTL expires
+            logger.exception("Failed to publish invalidation for %s", topic)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+
+                for message in pubsub.listen():
+                    try:
+                        topic, key = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+
+                    self._dispatch(topic, key)
+
+            except Exception:
+                logger.exception("Invalidation listener disconnected, retrying")
+                time.sleep(1)
+
+
+def build_invalidation_bus():
+    if settings.invalidation_backend == "redis":
+        return RedisInvalidationBus(settings.REDIS_URL)
+
+    return LocalInvalidationBus()
+
+
+invalidation_bus = build_invalidation_bus()
@@ -0,0 +1,106 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# -----------------------------
+# Audit pipeline
+# -----------------------------
+AUDIT_RECORDS_ENQUEUED = Counter(
+    "audit_records_enqueued_total",
+    "Audit records accepted into the in-memory queue",
+)
+
+AUDIT_RECORDS_DROPPED = Counter(
+    "audit_records_dropped_total",
+    "Audit records dropped before reaching the database",
+    ["reason"],  # queue_full | write_error
+)
+
+AUDIT_RECORDS_WRITTEN = Counter(
+    "audit_records_written_total",
+    "Audit records persisted by the background flusher",
+)
+
+AUDIT_QUEUE_DEPTH = Gauge(
+    "audit_queue_depth",
+    "Audit records waiting to be flushed",
+)
+
+AUDIT_FLUSH_SECONDS = Histogram(
+    "audit_flush_seconds",
+    "Time spent writing one batch of audit records",
+)
+
+# -----------------------------
+# Principal cache
+# -----------------------------
+PRINCIPAL_CACHE_REQUESTS = Counter(
+    "principal_cache_requests_total",
+    "Principal lookups by cache outcome",
+    ["result"],  # hit | miss
+)
+
+PRINCIPAL_CACHE_INVALIDATIONS = Counter(
+    "principal_cache_invalidations_total",
+    "Principal cache entries invalidated after user changes",
+)
+
+# -----------------------------
+# Password hashing pool
+# -----------------------------
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending",
+    "Password hash/verify operations queued or running in the worker pool",
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password operations rejected with 503 because the pool queue was full",
+)
+
+# -----------------------------
+# Rate limiting
+# -----------------------------
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate limit decisions by outcome and where they were made",
+    ["decision", "source"],  # allowed | rejected, local | store
+)
+
+# -----------------------------
+# Booking slot locks
+# -----------------------------
+BOOKING_LOCK_WAIT_SECONDS = Histogram(
+    "booking_lock_wait_seconds",
+    "Time spent acquiring the slot lock for a booking",
+    ["strategy"],  # blocking | nowait | advisory
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+BOOKING_LOCK_OUTCOMES = Counter(
+    "booking_lock_outcomes_total",
+    "Slot lock attempts by strategy and outcome",
+    ["strategy", "outcome"],  # acquired | conflict
+)
+
+# -----------------------------
+# Availability bitmap index
+# -----------------------------
+AVAILABILITY_INDEX_REQUESTS = Counter(
+    "availability_index_requests_total",
+    "Doctor-day bitmap lookups by cache outcome",
+    ["result"],  # hit | miss
+)
+
+AVAILABILITY_INDEX_DOCTORS = Gauge(
+    "availability_index_doctors",
+    "Doctors with at least one day loaded in the availability index",
+)
+
+AVAILABILITY_INDEX_BYTES = Gauge(
+    "availability_index_bytes",
+    "Memory held by the availability index",
+)
+
+AVAILABILITY_INDEX_BYTES_PER_DOCTOR = Gauge(
+    "availability_index_bytes_per_doctor",
+    "Mean availability index memory per loaded doctor",
+)
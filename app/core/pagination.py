@@ -0,0 +1,34 @@
+import base64
+import json
+from typing import Callable
+
+from fastapi import HTTPException
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last returned row as an opaque token.
+    """
+    raw = json.dumps([str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *parsers: Callable) -> tuple:
+    """
+    Decode a token produced by `encode_cursor`, converting each value
+    with the matching parser (e.g. `datetime.fromisoformat`, `UUID`).
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        if len(values) != len(parsers):
+            raise ValueError("cursor arity mismatch")
+
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,4 +1,239 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""
+Sliding-window rate limiting shared across workers.
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+- Counters live in a shared store (`RedisRateLimitStore`) and are updated
+  atomically with the sliding-window-counter algorithm: the previous
+  fixed window is weighted by how much of it still overlaps the sliding
+  window.
+- Each worker leases small batches of permits from the store and spends
+  them from a local token bucket, so most allowed requests never leave
+  the process.
+- Requests are keyed by authenticated user id when a valid bearer token
+  is present, otherwise by client address.
+
+`MemoryRateLimitStore` is the in-process stand-in used in tests and
+single-worker deployments.
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_DECISIONS
+from app.core.security import decode_access_token
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window_seconds: float
+
+    UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """
+        Parse "<count>/<unit>", e.g. "5/minute".
+        """
+        count, unit = value.split("/")
+        return cls(limit=int(count), window_seconds=cls.UNITS[unit.strip().rstrip("s")])
+
+
+# -----------------------------
+# Shared stores
+# -----------------------------
+
+def _window_state(window: float, now: float) -> tuple[int, float]:
+    index = int(now // window)
+    elapsed = (now - index * window) / window
+    return index, 1.0 - elapsed  # weight of the previous window
+
+
+class MemoryRateLimitStore:
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        # key -> {window index: count}, only the last two windows are kept
+        self._counters: dict[str, dict[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: int, window: float, amount: int = 1) -> bool:
+        index, prev_weight = _window_state(window, self._clock())
+
+        with self._lock:
+            windows = self._counters.get(key, {})
+            current = windows.get(index, 0)
+            previous = windows.get(index - 1, 0)
+
+            if previous * prev_weight + current + amount > limit:
+                return False
+
+            self._counters[key] = {index - 1: previous, index: current + amount}
+            return True
+
+
+class RedisRateLimitStore:
+    SCRIPT = """
+    local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+    local limit = tonumber(ARGV[1])
+    local amount = tonumber(ARGV[2])
+
+    if previous * tonumber(ARGV[3]) + current + amount > limit then
+        return 0
+    end
+
+    redis.call('INCRBY', KEYS[1], amount)
+    redis.call('PEXPIRE', KEYS[1], ARGV[4])
+    return 1
+    """
+
+    def __init__(self, url: str, clock: Callable[[], float] = time.time):
+        import redis
+
+        self._clock = clock
+        self._client = redis.Redis.from_url(url)
+        self._acquire = self._client.register_script(self.SCRIPT)
+
+    def acquire(self, key: str, limit: int, window: float, amount: int = 1) -> bool:
+        index, prev_weight = _window_state(window, self._clock())
+
+        allowed = self._acquire(
+            keys=[f"rl:{key}:{index}", f"rl:{key}:{index - 1}"],
+            args=[limit, amount, prev_weight, int(window * 2000)],
+        )
+        return bool(allowed)
+
+
+# -----------------------------
+# Local pre-check
+# -----------------------------
+
+class LocalTokenBucket:
+    """
+    Permits leased from the shared store and not yet spent by this worker.
+    Unspent permits expire so an idle worker does not hoard quota.
+    """
+
+    __slots__ = ("tokens", "expires_at")
+
+    def __init__(self, tokens: int, expires_at: float):
+        self.tokens = tokens
+        self.expires_at = expires_at
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        store,
+        policies: dict[str, str],
+        *,
+        lease_fraction: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.store = store
+        self.policies = {name: RateLimit.parse(rate) for name, rate in policies.items()}
+        self.lease_fraction = lease_fraction
+        self.enabled = True
+
+        self._clock = clock
+        self._buckets: dict[str, LocalTokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def limit(self, policy: str):
+        """
+        FastAPI dependency enforcing the named policy.
+        """
+        if policy not in self.policies:
+            raise KeyError(f"Unknown rate limit policy: {policy}")
+
+        def dependency(request: Request):
+            if not self.enabled:
+                return
+
+            rate = self.policies[policy]
+            if not self.hit(f"{policy}:{request_identity(request)}", rate):
+                raise HTTPException(
+                    status_code=429,
+                    detail="Rate limit exceeded",
+                    headers={"Retry-After": str(math.ceil(rate.window_seconds * self.lease_fraction))},
+                )
+
+        return dependency
+
+    def hit(self, key: str, rate: RateLimit) -> bool:
+        if self._take_local(key):
+            RATE_LIMIT_DECISIONS.labels(decision="allowed", source="local").inc()
+            return True
+
+        lease = max(1, int(rate.limit * self.lease_fraction))
+
+        # lease a batch; near the limit fall back to a single permit
+        for amount in dict.fromkeys((lease, 1)):
+            if self.store.acquire(key, rate.limit, rate.window_seconds, amount):
+                self._store_local(key, amount - 1, rate)
+                RATE_LIMIT_DECISIONS.labels(decision="allowed", source="store").inc()
+                return True
+
+        RATE_LIMIT_DECISIONS.labels(decision="rejected", source="store").inc()
+        return False
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def _take_local(self, key: str) -> bool:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return False
+
+            if bucket.expires_at <= self._clock() or bucket.tokens <= 0:
+                del self._buckets[key]
+                return False
+
+            bucket.tokens -= 1
+            return True
+
+    def _store_local(self, key: str, tokens: int, rate: RateLimit):
+        if tokens <= 0:
+            return
+
+        with self._lock:
+            self._buckets[key] = LocalTokenBucket(
+                tokens=tokens,
+                expires_at=self._clock() + rate.window_seconds * self.lease_fraction,
+            )
+
+
+def request_identity(request: Request) -> str:
+    """
+    Authenticated user id when a valid bearer token is sent,
+    otherwise the client address.
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+            if subject:
+                return f"user:{subject}"
+        except Exception:
+            pass
+
+    host: Optional[str] = request.client.host if request.client else None
+    return f"ip:{host or 'unknown'}"
+
+
+def build_rate_limit_store():
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimitStore(settings.REDIS_URL)
+
+    return MemoryRateLimitStore()
+
+
+limiter = RateLimiter(build_rate_limit_store(), settings.rate_limit_policies)
@@ -1,9 +1,25 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTED
 
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+# min == max == default: hashes created with any other cost are
+# reported by verify_and_update and transparently rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256"],
+    deprecated="auto",
+    bcrypt_sha256__default_rounds=settings.password_hash_rounds,
+    bcrypt_sha256__min_rounds=settings.password_hash_rounds,
+    bcrypt_sha256__max_rounds=settings.password_hash_rounds,
+)
 
 def get_password_hash(password: str):
     return pwd_context.hash(password)
@@ -11,8 +27,95 @@ def get_password_hash(password: str):
 def verify_password(plain: str, hashed: str):
     return pwd_context.verify(plain, hashed)
 
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+    """
+    Returns (is_valid, new_hash). `new_hash` is set when the stored hash
+    uses outdated cost parameters and should be replaced.
+    """
+    return pwd_context.verify_and_update(plain, hashed)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated, size-limited process pool.
+
+    Hashing never occupies the request threadpool or the event loop, and
+    at most `max_pending` operations may be queued: beyond that callers
+    get an immediate 503 instead of waiting behind a login burst.
+    """
+
+    def __init__(self, *, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+        return await self._submit(verify_and_update_password, plain, hashed)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, fn, *args) -> asyncio.Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                PASSWORD_HASH_REJECTED.inc()
+                raise HTTPException(
+                    status_code=503,
+                    detail="Authentication service busy, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # workers only need passlib; never fork DB connections
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+            self._pending += 1
+            PASSWORD_HASH_PENDING.set(self._pending)
+            future = self._executor.submit(fn, *args)
+
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.set(self._pending)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+
+def create_user_access_token(user) -> str:
+    """
+    Token carrying enough claims to authorize read-only requests
+    without a DB lookup: subject, role and the user's token version.
+    """
+    return create_access_token({
+        "sub": str(user.id),
+        "role": user.role,
+        "ver": user.token_version,
+    })
+
+def decode_access_token(token: str) -> dict:
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
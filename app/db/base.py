@@ -8,7 +8,7 @@ class Base(DeclarativeBase):
 # THIS LINE REGISTERS MODELS
 
 from app.modules.users.models import User
-from app.modules.availability.models import AvailabilitySlot
+from app.modules.availability.models import AvailabilitySlot, AvailabilitySchedule
 from app.modules.consultations.models import Consultation
 import app.db.models.idempotency_key
 from app.modules.bookings.models import Booking
@@ -1,20 +1,21 @@
+import asyncio
 import json
 import time
 import uuid
+from datetime import datetime, timezone
 from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import async_engine, engine, SessionLocal
 from sqlalchemy.exc import OperationalError
 
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from app.modules.audit.models import AuditLog
+from app.modules.audit.partitions import ensure_partitions
+from app.modules.audit.writer import audit_policy, audit_writer
 
+from app.core.logging import logger
 from app.core.rate_limiter import limiter
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.errors import RateLimitExceeded
-from slowapi import _rate_limit_exceeded_handler
+from app.core.security import password_hasher
+from app.modules.auth.principal import revoked_token_versions
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.modules.admin.routers import router as admin_router
@@ -27,6 +28,23 @@ from app.modules.consultations.routers import router as consultations_router
 from app.modules.payments.routers import router as payments_router
 from app.modules.prescriptions.routers import router as prescription_router
 
+AUDIT_PARTITION_CHECK_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def ensure_audit_partitions():
+    with engine.begin() as conn:
+        ensure_partitions(conn)
+
+
+async def maintain_audit_partitions():
+    # keeps future monthly partitions in place for long-running processes
+    while True:
+        await asyncio.sleep(AUDIT_PARTITION_CHECK_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(ensure_audit_partitions)
+        except Exception:
+            logger.exception("Audit partition maintenance failed")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -48,13 +66,29 @@ async def lifespan(app: FastAPI):
     if retries == 0:
         raise Exception("Database not available")
 
+    ensure_audit_partitions()
+
+    with SessionLocal() as db:
+        revoked_token_versions.load_recent(db)
+    partition_task = asyncio.create_task(maintain_audit_partitions())
+
+    audit_writer.start()
+
     yield  # Application runs here
 
     # -----------------------------
-    # Shutdown logic (optional)
+    # Shutdown logic
     # -----------------------------
     print("Shutting down application...")
 
+    partition_task.cancel()
+
+    # drain buffered audit records before the process exits
+    audit_writer.stop()
+
+    password_hasher.shutdown()
+    await async_engine.dispose()
+
 app = FastAPI(
     title="Telemedicine Backend",
     lifespan=lifespan
@@ -69,15 +103,9 @@ Instrumentator().instrument(app).expose(app, include_in_schema=False)
 # Rate limiter
 # -----------------------------
 
-# attach limiter
+# attach limiter (enforced per route via `Depends(limiter.limit(...))`)
 app.state.limiter = limiter
 
-# rate limit handler
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# middleware
-app.add_middleware(SlowAPIMiddleware)
-
 # -----------------------------
 # AUDIT LOGGING MIDDLEWARE
 # -----------------------------
@@ -86,25 +114,23 @@ app.add_middleware(SlowAPIMiddleware)
 async def audit_log_middleware(request: Request, call_next):
     response = await call_next(request)
 
-    db: Session = SessionLocal()
-    try:
-        user_id = getattr(request.state, "user_id", None)  # set in JWT auth
-
-        log = AuditLog(
-            user_id=user_id or uuid.UUID(int=0),  # if unknown, use null UUID
-            action=request.method + " " + request.url.path,  # e.g., "GET /consultations/search"
-            entity_type=None,       # optionally fill based on endpoint
-            entity_id=None,         # optionally fill based on request body or URL
-            event_data=json.dumps({
-                "status_code": response.status_code,
-                "query_params": dict(request.query_params)
-            })
-        )
-
-        db.add(log)
-        db.commit()
-    finally:
-        db.close()
+    if not audit_policy.should_log(request.method, request.url.path):
+        return response
+
+    user_id = getattr(request.state, "user_id", None)  # set in JWT auth
+
+    # Buffered: the background writer persists records in batches
+    audit_writer.submit({
+        "user_id": user_id or uuid.UUID(int=0),  # if unknown, use null UUID
+        "action": request.method + " " + request.url.path,  # e.g., "GET /consultations/search"
+        "entity_type": None,       # optionally fill based on endpoint
+        "entity_id": None,         # optionally fill based on request body or URL
+        "event_data": json.dumps({
+            "status_code": response.status_code,
+            "query_params": dict(request.query_params)
+        }),
+        "created_at": datetime.now(timezone.utc),
+    })
 
     return response
 
@@ -1,12 +1,16 @@
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.api.deps import get_db
 from app.modules.users.models import User
+from app.modules.auth.principal import Claims, Principal
 from app.modules.consultations.models import Consultation
 from app.modules.payments.models import Payment
-from app.modules.auth.dependencies import get_current_user
+from app.modules.auth.dependencies import get_current_claims, get_current_user
+from app.modules.admin.schemas import UserAdminUpdate, UserAdminResponse
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -14,7 +18,7 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 @router.get("/analytics")
 def get_admin_analytics(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Claims = Depends(get_current_claims),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -39,4 +43,67 @@ def get_admin_analytics(
         "consultations": total_consultations,
         "completed_consultations": completed_consultations,
         "total_revenue": float(total_revenue),
-    }
\ No newline at end of file
+    }
+
+
+@router.patch("/users/{user_id}", response_model=UserAdminResponse)
+def update_user(
+    user_id: UUID,
+    payload: UserAdminUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Change a user's role or deactivate them. Cached principals are
+    invalidated and outstanding tokens revoked on commit, so the change
+    applies to the next request.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    changed = False
+
+    if payload.role is not None and payload.role.value != user.role:
+        user.role = payload.role.value
+        changed = True
+
+    if payload.is_active is not None and payload.is_active != user.is_active:
+        user.is_active = payload.is_active
+        changed = True
+
+    # tokens carry the role claim, so outstanding ones must be revoked
+    if changed:
+        user.token_version += 1
+
+    db.commit()
+    db.refresh(user)
+
+    return user
+
+
+@router.post("/users/{user_id}/revoke-tokens", response_model=UserAdminResponse)
+def revoke_user_tokens(
+    user_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Invalidate every access token issued to the user so far.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user.token_version += 1
+
+    db.commit()
+    db.refresh(user)
+
+    return user
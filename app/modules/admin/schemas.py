@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+from uuid import UUID
+from typing import Optional
+
+from app.modules.auth.schemas import Role
+
+
+class UserAdminUpdate(BaseModel):
+    role: Optional[Role] = None
+    is_active: Optional[bool] = None
+
+
+class UserAdminResponse(BaseModel):
+    id: UUID
+    email: str
+    role: str
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
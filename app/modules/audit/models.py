@@ -1,21 +1,22 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, String, DateTime, Text, Index, PrimaryKeyConstraint, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.db.base import Base
+from app.modules.audit.partitions import create_default_partition, ensure_partitions
 
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
     id = Column(
-        UUID(as_uuid=True), 
-        primary_key=True, 
+        UUID(as_uuid=True),
+        primary_key=True,
         default=uuid.uuid4
     )
 
     user_id = Column(
-        UUID(as_uuid=True), 
+        UUID(as_uuid=True),
         nullable=False
     ) # BOOKING_CREATED, LOGIN, etc.
 
@@ -25,7 +26,7 @@ class AuditLog(Base):
 
     entity_type = Column(
         String, nullable=True
-    )  
+    )
 
     entity_id = Column(
         String, nullable=True
@@ -34,8 +35,30 @@ class AuditLog(Base):
     event_data = Column(
         Text, nullable=True
     )
-    
+
+    # partition key, so it must be part of the primary key
     created_at = Column(
-        DateTime(timezone=True), 
-        server_default=func.now()
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False
     )
+
+    # The primary key and every index end with (created_at, id) so
+    # filtered queries can walk the keyset cursor without a sort.
+    __table_args__ = (
+        PrimaryKeyConstraint("created_at", "id", name="pk_audit_logs"),
+        Index("ix_audit_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_audit_action_created_id", "action", "created_at", "id"),
+        Index(
+            "ix_audit_entity_created_id",
+            "entity_type", "entity_id", "created_at", "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+@event.listens_for(AuditLog.__table__, "after_create")
+def create_initial_partitions(target, connection, **kw):
+    create_default_partition(connection)
+    ensure_partitions(connection)
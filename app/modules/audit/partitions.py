@@ -0,0 +1,190 @@
+"""
+Monthly range partitioning and retention for `audit_logs`.
+
+Partitions are named `audit_logs_yYYYYmMM` and cover one calendar month
+of `created_at`. A default partition catches rows outside the managed
+range so an overdue maintenance run never fails a write.
+
+Run maintenance (create future partitions, archive expired ones):
+
+    python -m app.modules.audit.partitions
+"""
+import gzip
+import os
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def create_default_partition(conn: Connection):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+        f"PARTITION OF {PARENT_TABLE} DEFAULT"
+    ))
+
+
+def create_month_partition(conn: Connection, month: date):
+    month = month_start(month)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+
+
+def ensure_partitions(conn: Connection, months_ahead: int | None = None, today: date | None = None):
+    """
+    Create partitions for the current month and `months_ahead` future months.
+    """
+    if months_ahead is None:
+        months_ahead = settings.audit_partition_months_ahead
+
+    current = month_start(today or datetime.now(timezone.utc).date())
+
+    for offset in range(months_ahead + 1):
+        create_month_partition(conn, add_months(current, offset))
+
+
+def list_month_partitions(conn: Connection) -> dict[date, str]:
+    """
+    All monthly audit tables, attached or detached (e.g. by an interrupted
+    retention run), keyed by the month they cover.
+    """
+    rows = conn.execute(text(
+        "SELECT tablename FROM pg_tables "
+        "WHERE schemaname = current_schema() AND tablename LIKE :prefix"
+    ), {"prefix": f"{PARENT_TABLE}_y%"}).scalars()
+
+    partitions = {}
+    for name in rows:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+
+    return partitions
+
+
+def is_attached(conn: Connection, table_name: str) -> bool:
+    return conn.execute(text(
+        "SELECT EXISTS ("
+        "  SELECT 1 FROM pg_inherits i"
+        "  JOIN pg_class c ON c.oid = i.inhrelid"
+        "  WHERE c.relname = :name AND i.inhparent = CAST(:parent AS regclass)"
+        ")"
+    ), {"name": table_name, "parent": PARENT_TABLE}).scalar()
+
+
+def archive_partition(conn: Connection, table_name: str, archive_dir: str) -> str:
+    """
+    Detach a monthly partition, dump it to `<archive_dir>/<table>.csv.gz`
+    and drop it. The archive is fully written before the table is dropped.
+    """
+    if is_attached(conn, table_name):
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {table_name}"))
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{table_name}.csv.gz")
+    tmp_path = path + ".tmp"
+
+    cursor = conn.connection.cursor()
+    try:
+        with gzip.open(tmp_path, "wb") as archive:
+            cursor.copy_expert(
+                f"COPY {table_name} TO STDOUT WITH (FORMAT csv, HEADER)",
+                archive,
+            )
+            archive.flush()
+            os.fsync(archive.fileobj.fileno())
+    finally:
+        cursor.close()
+
+    os.replace(tmp_path, path)
+
+    conn.execute(text(f"DROP TABLE {table_name}"))
+    return path
+
+
+def expired_partitions(
+    conn: Connection,
+    *,
+    retain_months: int | None = None,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Monthly partitions older than `retain_months`, oldest first.
+    """
+    if retain_months is None:
+        retain_months = settings.audit_retention_months
+
+    cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retain_months)
+
+    return [
+        table_name
+        for month, table_name in sorted(list_month_partitions(conn).items())
+        if month < cutoff
+    ]
+
+
+def archive_expired_partitions(
+    conn: Connection,
+    *,
+    retain_months: int | None = None,
+    archive_dir: str | None = None,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Archive every monthly partition older than `retain_months`.
+    Returns the written archive paths.
+    """
+    archived = []
+    for table_name in expired_partitions(conn, retain_months=retain_months, today=today):
+        archived.append(archive_partition(conn, table_name, archive_dir or settings.audit_archive_dir))
+
+    return archived
+
+
+def run_maintenance(engine) -> list[str]:
+    with engine.begin() as conn:
+        ensure_partitions(conn)
+        expired = expired_partitions(conn)
+
+    # one transaction per partition keeps the parent table lock short
+    archived = []
+    for table_name in expired:
+        with engine.begin() as conn:
+            path = archive_partition(conn, table_name, settings.audit_archive_dir)
+
+        logger.info("Archived audit partition %s to %s", table_name, path)
+        archived.append(path)
+
+    return archived
+
+
+if __name__ == "__main__":
+    from app.db.session import engine
+
+    for archive_path in run_maintenance(engine):
+        print(archive_path)
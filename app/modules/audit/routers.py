@@ -1,10 +1,66 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+
 from app.api.deps import get_db
-from app.modules.audit.models import AuditLog
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.session import SessionLocal
+from app.modules.audit.schemas import AuditLogResponse
+from app.modules.audit.services import AuditLogFilters, list_audit_logs, stream_audit_logs
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
-@router.get("/")
-def list_logs(db: Session = Depends(get_db)):
-    return db.query(AuditLog).all()
+
+def get_audit_filters(
+    user_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> AuditLogFilters:
+    return AuditLogFilters(
+        user_id=user_id,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
+@router.get("/", response_model=list[AuditLogResponse])
+def list_logs(
+    response: Response,
+    filters: AuditLogFilters = Depends(get_audit_filters),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    logs, next_cursor = list_audit_logs(db, filters, cursor=cursor, limit=limit)
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return logs
+
+
+@router.get("/export")
+def export_logs(filters: AuditLogFilters = Depends(get_audit_filters)):
+    """
+    Stream every matching audit log as NDJSON.
+    """
+
+    def generate():
+        # owned by the stream, not the request, so it lives until the last row
+        db = SessionLocal()
+        try:
+            yield from stream_audit_logs(db, filters)
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
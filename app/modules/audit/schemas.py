@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+
+class AuditLogResponse(BaseModel):
+    id: UUID
+    user_id: UUID
+    action: str
+    entity_type: Optional[str]
+    entity_id: Optional[str]
+    event_data: Optional[str]
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.modules.audit.models import AuditLog
+from app.modules.audit.schemas import AuditLogResponse
+
+
+EXPORT_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class AuditLogFilters:
+    user_id: Optional[UUID] = None
+    action: Optional[str] = None
+    entity_type: Optional[str] = None
+    entity_id: Optional[str] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+
+def build_audit_query(db: Session, filters: AuditLogFilters):
+    query = db.query(AuditLog)
+
+    if filters.user_id:
+        query = query.filter(AuditLog.user_id == filters.user_id)
+
+    if filters.action:
+        query = query.filter(AuditLog.action == filters.action)
+
+    if filters.entity_type:
+        query = query.filter(AuditLog.entity_type == filters.entity_type)
+
+    if filters.entity_id:
+        query = query.filter(AuditLog.entity_id == filters.entity_id)
+
+    if filters.date_from:
+        query = query.filter(AuditLog.created_at >= filters.date_from)
+
+    if filters.date_to:
+        query = query.filter(AuditLog.created_at <= filters.date_to)
+
+    # newest first; (created_at, id) is the keyset
+    return query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+
+
+def list_audit_logs(
+    db: Session,
+    filters: AuditLogFilters,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> tuple[list[AuditLog], Optional[str]]:
+    """
+    Keyset-paginated audit log listing.
+
+    Returns the page and an opaque cursor for the next page
+    (None when there are no more rows).
+    """
+    query = build_audit_query(db, filters)
+
+    if cursor:
+        created_at, log_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        query = query.filter(
+            # plain bound lets the planner prune newer partitions
+            AuditLog.created_at <= created_at,
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(created_at, log_id),
+        )
+
+    # fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at.isoformat(), last.id)
+
+
+def stream_audit_logs(db: Session, filters: AuditLogFilters) -> Iterator[str]:
+    """
+    Yield matching audit logs as NDJSON lines.
+
+    Uses a server-side cursor so memory stays constant
+    regardless of how many rows match.
+    """
+    query = build_audit_query(db, filters).yield_per(EXPORT_BATCH_SIZE)
+
+    for log in query:
+        yield AuditLogResponse.model_validate(log).model_dump_json() + "\n"
@@ -0,0 +1,185 @@
+import queue
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import (
+    AUDIT_FLUSH_SECONDS,
+    AUDIT_QUEUE_DEPTH,
+    AUDIT_RECORDS_DROPPED,
+    AUDIT_RECORDS_ENQUEUED,
+    AUDIT_RECORDS_WRITTEN,
+)
+from app.db.session import SessionLocal
+from app.modules.audit.models import AuditLog
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class AuditPolicy:
+    """
+    Decides which HTTP requests produce an audit record.
+
+    - Excluded path prefixes are never logged (e.g. /metrics scrapes)
+    - Mutating requests are always logged
+    - Read-only requests are sampled at `sample_rate`
+    """
+
+    def __init__(self, excluded_paths: list[str], sample_rate: float = 1.0):
+        self.excluded_paths = tuple(excluded_paths)
+        self.sample_rate = sample_rate
+
+    def should_log(self, method: str, path: str) -> bool:
+        if path.startswith(self.excluded_paths):
+            return False
+
+        if method in SAFE_METHODS and self.sample_rate < 1.0:
+            return random.random() < self.sample_rate
+
+        return True
+
+
+class AuditLogWriter:
+    """
+    Buffered audit writer.
+
+    Request handlers call `submit()`, which never touches the database.
+    A background thread drains the bounded queue and writes records in
+    multi-row INSERT batches, flushing when `batch_size` records are
+    pending or `flush_interval` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+    def submit(self, record: dict) -> bool:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            AUDIT_RECORDS_DROPPED.labels(reason="queue_full").inc()
+            return False
+
+        AUDIT_RECORDS_ENQUEUED.inc()
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="audit-log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the flusher and drain everything still queued.
+        """
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+        while self.flush():
+            pass
+
+    # -----------------------------
+    # Consumer side
+    # -----------------------------
+    def flush(self) -> int:
+        """
+        Write up to `batch_size` queued records synchronously.
+        Returns the number of records taken off the queue.
+        """
+        batch = []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        self._write(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+
+    def _write(self, batch: list[dict]):
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+        if not batch:
+            return
+
+        db = self.session_factory()
+        try:
+            with AUDIT_FLUSH_SECONDS.time():
+                db.execute(insert(AuditLog), batch)
+                db.commit()
+
+            AUDIT_RECORDS_WRITTEN.inc(len(batch))
+
+        except Exception:
+            db.rollback()
+            AUDIT_RECORDS_DROPPED.labels(reason="write_error").inc(len(batch))
+            logger.exception("Failed to write %d audit records", len(batch))
+
+        finally:
+            db.close()
+
+
+audit_policy = AuditPolicy(
+    excluded_paths=settings.audit_excluded_paths,
+    sample_rate=settings.audit_sample_rate,
+)
+
+audit_writer = AuditLogWriter(
+    max_queue_size=settings.audit_queue_max_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+)
@@ -1,28 +1,66 @@
+from uuid import UUID
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt
-from sqlalchemy.orm import Session
-from app.api.deps import get_db
-from app.modules.users.models import User
-from app.core.config import settings
+from app.api.deps import DbSession, get_session, run_db
+from app.core.security import decode_access_token
+from app.modules.auth.principal import (
+    Claims,
+    Principal,
+    principal_cache,
+    revoked_token_versions,
+)
 
 security = HTTPBearer()
 
-def get_current_user(
+
+def get_token_claims(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    token = credentials.credentials
+) -> Claims:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
+        payload = decode_access_token(credentials.credentials)
+        claims = Claims(
+            id=UUID(payload.get("sub")),
+            role=payload.get("role"),
+            # tokens issued before versioning count as version 0
+            token_version=int(payload.get("ver", 0)),
+        )
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    if revoked_token_versions.is_revoked(claims.id, claims.token_version):
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    return claims
+
+
+def get_current_claims(claims: Claims = Depends(get_token_claims)) -> Claims:
+    """
+    Fast path for read-only endpoints: authorizes from the token alone.
+
+    Role changes and deactivation bump the user's token version, so
+    stale claims are rejected through the revocation set.
+    """
+    if not claims.role:
+        # legacy token without a role claim
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    return claims
+
+
+async def get_current_user(
+    claims: Claims = Depends(get_token_claims),
+    db: DbSession = Depends(get_session)
+) -> Principal:
+    # served from the principal cache; falls back to the DB on miss
+    user = await run_db(db, principal_cache.get, claims.id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    if claims.token_version != user.token_version:
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    if not user.is_active:
+        raise HTTPException(status_code=403, detail="Account disabled")
+
     return user
@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import PRINCIPAL_CACHE_INVALIDATIONS, PRINCIPAL_CACHE_REQUESTS
+from app.modules.users.models import User
+
+
+PRINCIPAL_TOPIC = "principal"
+TOKEN_VERSION_TOPIC = "token_version"
+
+# changes to these fields must be visible on the very next request
+AUTHZ_FIELDS = ("email", "role", "is_active", "token_version")
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Immutable snapshot of the authenticated user.
+    """
+    id: UUID
+    email: str
+    role: str
+    is_active: bool
+    token_version: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            token_version=user.token_version,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Claims:
+    """
+    Identity taken from a verified access token alone (no DB lookup).
+    Only valid for read-only authorization decisions.
+    """
+    id: UUID
+    role: str
+    token_version: int
+
+
+class PrincipalCache:
+    def __init__(self, *, max_size: int, ttl_seconds: float):
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        invalidation_bus.subscribe(PRINCIPAL_TOPIC, self._evict)
+
+    def get(self, db: Session, user_id: UUID) -> Optional[Principal]:
+        principal = self._cache.get(user_id)
+        if principal is not None:
+            PRINCIPAL_CACHE_REQUESTS.labels(result="hit").inc()
+            return principal
+
+        PRINCIPAL_CACHE_REQUESTS.labels(result="miss").inc()
+
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return None
+
+        principal = Principal.from_user(user)
+        self._cache.set(user_id, principal)
+        return principal
+
+    def invalidate(self, user_id: UUID):
+        invalidation_bus.publish(PRINCIPAL_TOPIC, str(user_id))
+
+    def clear(self):
+        self._cache.clear()
+
+    def _evict(self, key: str):
+        PRINCIPAL_CACHE_INVALIDATIONS.inc()
+        self._cache.invalidate(UUID(key))
+
+
+class RevokedTokenVersions:
+    """
+    Small in-memory map of user id -> lowest token version still valid.
+
+    Entries only need to outlive the tokens they revoke, so they expire
+    after the access token lifetime.
+    """
+
+    def __init__(self, *, max_size: int, ttl_seconds: float):
+        self._versions = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        invalidation_bus.subscribe(TOKEN_VERSION_TOPIC, self._record)
+
+    def is_revoked(self, user_id: UUID, token_version: int) -> bool:
+        current = self._versions.get(user_id)
+        return current is not None and token_version < current
+
+    def revoke(self, user_id: UUID, current_version: int):
+        invalidation_bus.publish(TOKEN_VERSION_TOPIC, f"{user_id}:{current_version}")
+
+    def load_recent(self, db: Session):
+        """
+        Seed from users whose tokens were revoked within the token
+        lifetime, so a freshly started worker does not miss revocations.
+        """
+        cutoff = func.now() - timedelta(minutes=settings.access_token_expire_minutes)
+        rows = db.query(User.id, User.token_version).filter(
+            User.token_version > 0,
+            User.updated_at >= cutoff,
+        )
+
+        for user_id, version in rows:
+            self._set(user_id, version)
+
+    def clear(self):
+        self._versions.clear()
+
+    def _record(self, key: str):
+        user_id, version = key.split(":")
+        self._set(UUID(user_id), int(version))
+
+    def _set(self, user_id: UUID, version: int):
+        current = self._versions.get(user_id)
+        if current is None or version > current:
+            self._versions.set(user_id, version)
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+revoked_token_versions = RevokedTokenVersions(
+    max_size=settings.revoked_token_versions_max_size,
+    ttl_seconds=settings.access_token_expire_minutes * 60,
+)
+
+
+# -----------------------------
+# Invalidation hooks
+# -----------------------------
+# Collected at flush, published only once the change is committed, so a
+# concurrent request cannot re-cache the pre-commit row.
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    for obj in session.dirty | session.deleted:
+        if not isinstance(obj, User):
+            continue
+
+        state = inspect(obj)
+        if obj in session.deleted or any(
+            state.attrs[field].history.has_changes() for field in AUTHZ_FIELDS
+        ):
+            session.info.setdefault("changed_principals", set()).add(obj.id)
+
+        if state.attrs["token_version"].history.has_changes():
+            session.info.setdefault("revoked_tokens", {})[obj.id] = obj.token_version
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session):
+    for user_id, version in session.info.pop("revoked_tokens", {}).items():
+        revoked_token_versions.revoke(user_id, version)
+
+    for user_id in session.info.pop("changed_principals", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop("changed_principals", None)
+    session.info.pop("revoked_tokens", None)
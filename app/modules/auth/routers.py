@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.rate_limiter import limiter   # reuse limiter from main
 from passlib.exc import UnknownHashError
@@ -6,37 +7,55 @@ from passlib.exc import UnknownHashError
 from app.api.deps import get_db
 from app.modules.users.models import User, Role
 from app.modules.auth.schemas import SignupRequest, TokenResponse, LoginRequest
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import password_hasher, create_user_access_token
 
 
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-@router.post("/signup", status_code=201, response_model=TokenResponse)
-@limiter.limit("3/minute")
-def signup(request: Request, data: SignupRequest, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == data.email).first()
+
+def _find_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
+# bcrypt runs in the password hashing pool; DB work stays in the threadpool
+
+@router.post(
+    "/signup",
+    status_code=201,
+    response_model=TokenResponse,
+    dependencies=[Depends(limiter.limit("signup"))],
+)
+async def signup(data: SignupRequest, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_find_user_by_email, db, data.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user = User(
         email=data.email,
-        password_hash=get_password_hash(data.password),
+        password_hash=await password_hasher.hash(data.password),
         role=data.role.value,
         mfa_enabled=False,
         is_active=True,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await run_in_threadpool(_save_user, db, user)
 
-    token = create_access_token({"sub": str(user.id)})
+    token = create_user_access_token(user)
     return {"access_token": token}
 
-@router.post("/login", response_model=TokenResponse)
-@limiter.limit("5/minute")
-def login(request: Request, payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[Depends(limiter.limit("login"))],
+)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user_by_email, db, payload.email)
 
     # user not found
     if not user:
@@ -47,17 +66,21 @@ def login(request: Request, payload: LoginRequest, db: Session = Depends(get_db)
 
     # password incorrect
     try:
-        if not verify_password(payload.password, user.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials"
-            )
+        valid, new_hash = await password_hasher.verify_and_update(
+            payload.password, user.password_hash
+        )
     except UnknownHashError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
     # account is disabled
     if not user.is_active:
         raise HTTPException(
@@ -65,5 +88,10 @@ def login(request: Request, payload: LoginRequest, db: Session = Depends(get_db)
             detail="Account disabled"
         )
 
-    token = create_access_token({"sub": str(user.id)})
+    # cost parameters changed since this hash was created
+    if new_hash:
+        user.password_hash = new_hash
+        await run_in_threadpool(_save_user, db, user)
+
+    token = create_user_access_token(user)
     return {"access_token": token}
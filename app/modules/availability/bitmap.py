@@ -0,0 +1,259 @@
+"""
+In-memory availability index: one pair of bit arrays per doctor per UTC day.
+
+Each day is split into fixed 5-minute buckets (288 bits = 36 bytes):
+
+- `free`: bucket lies entirely inside an unbooked slot
+- `starts`: an unbooked slot starts in the bucket
+
+Free/busy checks are a single bit test; next-free queries scan the
+`starts` bits. Days are loaded lazily from the DB on miss and kept
+current by open/close events published on the invalidation bus, so
+every worker applies the same change.
+
+The index is advisory: bookings are still validated under the slot
+row lock, and entries expire after `availability_index_ttl_seconds`.
+"""
+import sys
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import (
+    AVAILABILITY_INDEX_BYTES,
+    AVAILABILITY_INDEX_BYTES_PER_DOCTOR,
+    AVAILABILITY_INDEX_DOCTORS,
+    AVAILABILITY_INDEX_REQUESTS,
+)
+
+
+AVAILABILITY_TOPIC = "availability"
+
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+BYTES_PER_DAY = BUCKETS_PER_DAY // 8
+
+BUCKET = timedelta(minutes=BUCKET_MINUTES)
+DAY = timedelta(days=1)
+
+
+class DayBitmap:
+    __slots__ = ("free", "starts")
+
+    def __init__(self):
+        self.free = bytearray(BYTES_PER_DAY)
+        self.starts = bytearray(BYTES_PER_DAY)
+
+    def set_slot(self, first: int, last: int, start: Optional[int], value: bool):
+        """
+        Mark buckets [first, last) free (or busy) and flag the start bucket.
+        """
+        for bucket in range(first, last):
+            _set_bit(self.free, bucket, value)
+
+        if start is not None:
+            _set_bit(self.starts, start, value)
+
+    def is_free(self, bucket: int) -> bool:
+        return bool(self.free[bucket >> 3] & (1 << (bucket & 7)))
+
+    def iter_starts(self, from_bucket: int = 0) -> Iterator[int]:
+        bits = int.from_bytes(self.starts, "little") >> from_bucket
+        offset = from_bucket
+
+        while bits:
+            lowest = (bits & -bits).bit_length() - 1
+            yield offset + lowest
+            bits >>= lowest + 1
+            offset += lowest + 1
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.free) + sys.getsizeof(self.starts)
+
+
+def _set_bit(bits: bytearray, bucket: int, value: bool):
+    if value:
+        bits[bucket >> 3] |= 1 << (bucket & 7)
+    else:
+        bits[bucket >> 3] &= ~(1 << (bucket & 7)) & 0xFF
+
+
+def _utc(value: datetime) -> datetime:
+    # naive timestamps are stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _bucket_floor(day: date, value: datetime) -> int:
+    return int((value - _day_start(day)) // BUCKET)
+
+
+def _bucket_ceil(day: date, value: datetime) -> int:
+    return -int(-(value - _day_start(day)) // BUCKET)
+
+
+class AvailabilityIndex:
+    def __init__(self, *, max_days: int, ttl_seconds: float):
+        self._days = TTLCache(max_size=max_days, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        invalidation_bus.subscribe(AVAILABILITY_TOPIC, self._apply)
+
+    # -- queries --------------------------------------------------------
+
+    def is_free(self, db: Session, doctor_id: UUID, at: datetime) -> bool:
+        at = _utc(at)
+        bitmap = self._day(db, doctor_id, at.date())
+        return bitmap.is_free(_bucket_floor(at.date(), at))
+
+    def next_free(
+        self,
+        db: Session,
+        doctor_id: UUID,
+        after: datetime,
+        count: int = 1,
+        horizon_days: Optional[int] = None,
+    ) -> list[datetime]:
+        """
+        Start buckets of the `count` earliest unbooked slots at or after
+        `after`, looking at most `horizon_days` ahead.
+        """
+        after = _utc(after)
+        horizon_days = horizon_days or settings.availability_index_horizon_days
+
+        found: list[datetime] = []
+        day = after.date()
+
+        for _ in range(horizon_days):
+            bitmap = self._day(db, doctor_id, day)
+            from_bucket = _bucket_floor(day, after) if day == after.date() else 0
+
+            for bucket in bitmap.iter_starts(from_bucket):
+                found.append(_day_start(day) + bucket * BUCKET)
+                if len(found) == count:
+                    return found
+
+            day += DAY
+
+        return found
+
+    # -- maintenance ----------------------------------------------------
+
+    def slot_opened(self, doctor_id: UUID, start_time: datetime, end_time: datetime):
+        self._publish("open", doctor_id, start_time, end_time)
+
+    def slot_closed(self, doctor_id: UUID, start_time: datetime, end_time: datetime):
+        self._publish("close", doctor_id, start_time, end_time)
+
+    def invalidate(self, doctor_id: UUID, start_date: date, end_date: date):
+        """
+        Drop whole days, e.g. after a bulk schedule expansion.
+        """
+        day = start_date
+        while day <= end_date:
+            invalidation_bus.publish(AVAILABILITY_TOPIC, f"evict|{doctor_id}|{day.isoformat()}")
+            day += DAY
+
+    def clear(self):
+        self._days.clear()
+
+    # -- memory ---------------------------------------------------------
+
+    def memory_bytes(self, doctor_id: Optional[UUID] = None) -> int:
+        return sum(
+            bitmap.nbytes()
+            for (loaded_doctor, _), bitmap in self._days.items()
+            if doctor_id is None or loaded_doctor == doctor_id
+        )
+
+    def doctor_count(self) -> int:
+        return len({doctor_id for (doctor_id, _), _ in self._days.items()})
+
+    # -- internals ------------------------------------------------------
+
+    def _day(self, db: Session, doctor_id: UUID, day: date) -> DayBitmap:
+        bitmap = self._days.get((doctor_id, day))
+        if bitmap is not None:
+            AVAILABILITY_INDEX_REQUESTS.labels(result="hit").inc()
+            return bitmap
+
+        AVAILABILITY_INDEX_REQUESTS.labels(result="miss").inc()
+
+        rows = db.execute(text("""
+            SELECT start_time, end_time FROM availability_slots
+            WHERE doctor_id = :doctor_id
+              AND is_booked = false
+              AND start_time < :day_end
+              AND end_time > :day_start
+        """), {
+            "doctor_id": doctor_id,
+            "day_start": _day_start(day),
+            "day_end": _day_start(day) + DAY,
+        })
+
+        bitmap = DayBitmap()
+        with self._lock:
+            for start_time, end_time in rows:
+                self._mark(bitmap, day, _utc(start_time), _utc(end_time), True)
+            self._days.set((doctor_id, day), bitmap)
+
+        return bitmap
+
+    def _mark(self, bitmap: DayBitmap, day: date, start_time: datetime, end_time: datetime, value: bool):
+        day_start = _day_start(day)
+
+        # only buckets fully covered by the slot count as free
+        first = max(0, _bucket_ceil(day, max(start_time, day_start)))
+        last = min(BUCKETS_PER_DAY, _bucket_floor(day, min(end_time, day_start + DAY)))
+        start = _bucket_floor(day, start_time) if start_time.date() == day else None
+
+        bitmap.set_slot(first, last, start, value)
+
+    def _publish(self, op: str, doctor_id: UUID, start_time: datetime, end_time: datetime):
+        invalidation_bus.publish(
+            AVAILABILITY_TOPIC,
+            f"{op}|{doctor_id}|{_utc(start_time).isoformat()}|{_utc(end_time).isoformat()}",
+        )
+
+    def _apply(self, key: str):
+        op, doctor_id, *args = key.split("|")
+        doctor_id = UUID(doctor_id)
+
+        if op == "evict":
+            self._days.invalidate((doctor_id, date.fromisoformat(args[0])))
+            return
+
+        start_time, end_time = (datetime.fromisoformat(value) for value in args)
+
+        # only days already loaded are patched; others load fresh on miss
+        day = start_time.date()
+        with self._lock:
+            while _day_start(day) < end_time:
+                bitmap = self._days.get((doctor_id, day))
+                if bitmap is not None:
+                    self._mark(bitmap, day, start_time, end_time, op == "open")
+                day += DAY
+
+
+availability_index = AvailabilityIndex(
+    max_days=settings.availability_index_max_days,
+    ttl_seconds=settings.availability_index_ttl_seconds,
+)
+
+# computed at scrape time
+AVAILABILITY_INDEX_BYTES.set_function(availability_index.memory_bytes)
+AVAILABILITY_INDEX_DOCTORS.set_function(availability_index.doctor_count)
+AVAILABILITY_INDEX_BYTES_PER_DOCTOR.set_function(
+    lambda: availability_index.memory_bytes() / max(1, availability_index.doctor_count())
+)
@@ -1,6 +1,9 @@
 import uuid
-from sqlalchemy import Column, DateTime, Boolean, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column, Computed, Date, DateTime, Boolean, DDL, ForeignKey, Index, Integer, String,
+    UniqueConstraint, event, false
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSTZRANGE, UUID, ExcludeConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -33,11 +36,23 @@ class AvailabilitySlot(Base):
         nullable=False
     )
 
+    # maintained by Postgres, backs the non-overlap exclusion constraint
+    time_range = Column(
+        TSTZRANGE,
+        Computed("tstzrange(start_time, end_time, '[)')", persisted=True),
+    )
+
     is_booked = Column(
         Boolean, default=False,
         nullable=False
     )
 
+    schedule_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("availability_schedules.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -54,6 +69,68 @@ class AvailabilitySlot(Base):
     doctor = relationship("User")
 
     __table_args__ = (
-        Index("ix_doctor_start_time", "doctor_id", "start_time"),
-        # Index("ix_slot_time_range", "start_time", "end_time"),
+        # per-doctor listing, keyset on (start_time, id)
+        Index("ix_doctor_start_time_id", "doctor_id", "start_time", "id"),
+        # open-slot search: keyset on (start_time, id), covers the response
+        Index(
+            "ix_open_slots_start",
+            "start_time", "id",
+            postgresql_where=is_booked == false(),
+            postgresql_include=["doctor_id", "end_time"],
+        ),
+        # a doctor's slots may not overlap (needs btree_gist for the uuid "=")
+        ExcludeConstraint(
+            ("doctor_id", "="),
+            ("time_range", "&&"),
+            name="ex_slot_no_overlap",
+            using="gist",
+        ),
+    )
+
+
+event.listen(
+    AvailabilitySlot.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
+
+
+class AvailabilitySchedule(Base):
+    """
+    A recurring weekly schedule a doctor published; its slots are
+    expanded into availability_slots when the schedule is submitted.
+    """
+    __tablename__ = "availability_schedules"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    doctor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # hash of the normalized request, re-submissions map to the same row
+    fingerprint = Column(String(64), nullable=False)
+
+    timezone = Column(String(64), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    slot_minutes = Column(Integer, nullable=False)
+
+    # weekly rules, breaks and exceptions as submitted
+    definition = Column(JSONB, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("doctor_id", "fingerprint", name="uq_schedule_fingerprint"),
     )
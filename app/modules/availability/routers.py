@@ -1,42 +1,140 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from uuid import UUID
 
-from app.api.deps import get_db
+from app.api.deps import DbSession, get_session, run_db
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.modules.auth.dependencies import get_current_user
-from .schemas import AvailabilityCreate, AvailabilityResponse
-from .services import create_availability, list_availability
+from .bitmap import availability_index
+from .schemas import (
+    AvailabilityCreate,
+    AvailabilityResponse,
+    FreeBusyResponse,
+    ScheduleCreate,
+    ScheduleResponse,
+)
+from .services import (
+    OpenSlotFilters,
+    create_availability,
+    create_schedule,
+    list_availability,
+    next_free_slots,
+    search_open_slots,
+)
 
 router = APIRouter(prefix="/availability", tags=["Availability"])
 
 
 @router.post("/", response_model=AvailabilityResponse)
-def create_slot(
+async def create_slot(
     payload: AvailabilityCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     current_user=Depends(get_current_user)
 ):
     if current_user.role != "doctor":
         raise Exception("Only doctors can create availability.")
 
-    return create_availability(
+    return await run_db(
         db,
+        create_availability,
         doctor_id=current_user.id,
         start_time=payload.start_time,
         end_time=payload.end_time
     )
 
 
+@router.post("/schedules", response_model=ScheduleResponse)
+async def create_recurring_schedule(
+    payload: ScheduleCreate,
+    db: DbSession = Depends(get_session),
+    current_user=Depends(get_current_user)
+):
+    if current_user.role != "doctor":
+        raise HTTPException(status_code=403, detail="Only doctors can create availability")
+
+    return await run_db(db, create_schedule, doctor_id=current_user.id, payload=payload)
+
+
+def get_open_slot_filters(
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    specialization: Optional[str] = None,
+    min_fee: Optional[Decimal] = Query(None, ge=0),
+    max_fee: Optional[Decimal] = Query(None, ge=0),
+) -> OpenSlotFilters:
+    return OpenSlotFilters(
+        start_from=start_from,
+        start_to=start_to,
+        specialization=specialization,
+        min_fee=min_fee,
+        max_fee=max_fee,
+    )
+
+
+@router.get("/search", response_model=list[AvailabilityResponse])
+async def search_slots(
+    response: Response,
+    filters: OpenSlotFilters = Depends(get_open_slot_filters),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: DbSession = Depends(get_session)
+):
+    slots, next_cursor = await run_db(
+        db, search_open_slots, filters, cursor=cursor, limit=limit
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return slots
+
+
 @router.get("/doctor/{doctor_id}", response_model=list[AvailabilityResponse])
-def get_doctor_availability(
+async def get_doctor_availability(
     doctor_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0),
-    limit: int = Query(20, le=100),
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_session)
 ):
-    return list_availability(
+    slots, next_cursor = await run_db(
         db,
+        list_availability,
         doctor_id=doctor_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return slots
+
+
+@router.get("/doctor/{doctor_id}/free", response_model=FreeBusyResponse)
+async def get_doctor_free_busy(
+    doctor_id: UUID,
+    at: datetime,
+    db: DbSession = Depends(get_session)
+):
+    return FreeBusyResponse(
+        doctor_id=doctor_id,
+        at=at,
+        free=await run_db(db, availability_index.is_free, doctor_id, at),
+        index_bytes=availability_index.memory_bytes(doctor_id),
     )
+
+
+@router.get("/doctor/{doctor_id}/next-free", response_model=list[AvailabilityResponse])
+async def get_doctor_next_free(
+    doctor_id: UUID,
+    after: Optional[datetime] = None,
+    count: int = Query(1, ge=1, le=50),
+    db: DbSession = Depends(get_session)
+):
+    return await run_db(db, next_free_slots, doctor_id, after=after, count=count)
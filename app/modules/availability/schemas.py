@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime, time
+from typing import Optional
 from uuid import UUID
 
 
@@ -18,3 +19,43 @@ class AvailabilityResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WeeklyRule(BaseModel):
+    weekday: int = Field(ge=0, le=6)  # 0 = Monday
+    start: time
+    end: time
+
+
+class ScheduleBreak(BaseModel):
+    weekday: Optional[int] = Field(default=None, ge=0, le=6)  # None = every day
+    start: time
+    end: time
+
+
+class ScheduleException(BaseModel):
+    date: date
+    # whole day off when no times are given
+    start: Optional[time] = None
+    end: Optional[time] = None
+
+
+class ScheduleCreate(BaseModel):
+    start_date: date
+    end_date: date
+    timezone: str = "UTC"
+    slot_minutes: int = Field(ge=5, le=240)
+    rules: list[WeeklyRule] = Field(min_length=1)
+    breaks: list[ScheduleBreak] = []
+    exceptions: list[ScheduleException] = []
+
+
+class ScheduleResponse(BaseModel):
+    schedule_id: UUID
+    created: int
+    skipped: int
+
+
+class FreeBusyResponse(BaseModel):
+    doctor_id: UUID
+    at: datetime
+    free: bool
+    index_bytes: int  # memory the index holds for this doctor
@@ -1,28 +1,28 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import false, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
 from fastapi import HTTPException
 from uuid import UUID
 
-from .models import AvailabilitySlot
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.modules.doctors.models import Doctor
+from .bitmap import BUCKET, availability_index
+from .models import AvailabilitySchedule, AvailabilitySlot
+from .schemas import ScheduleCreate
 
 
-def check_overlap(
-    db: Session,
-    doctor_id: UUID,
-    start_time,
-    end_time
-):
-    overlapping = db.query(AvailabilitySlot).filter(
-        AvailabilitySlot.doctor_id == doctor_id,
-        AvailabilitySlot.start_time < end_time,
-        AvailabilitySlot.end_time > start_time
-    ).first()
-
-    if overlapping:
-        raise HTTPException(
-            status_code=400,
-            detail="Availability slot overlaps with existing slot."
-        )
+# SQLSTATE exclusion_violation, raised by ex_slot_no_overlap
+EXCLUSION_VIOLATION = "23P01"
 
 
 def create_availability(
@@ -37,18 +37,29 @@ def create_availability(
             detail="Start time must be before end time."
         )
 
-    check_overlap(db, doctor_id, start_time, end_time)
-
     slot = AvailabilitySlot(
         doctor_id=doctor_id,
         start_time=start_time,
         end_time=end_time
     )
 
-    db.add(slot)
-    db.commit()
+    # overlap is enforced by the exclusion constraint, no read-then-insert
+    try:
+        db.add(slot)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if getattr(exc.orig, "pgcode", None) == EXCLUSION_VIOLATION:
+            raise HTTPException(
+                status_code=400,
+                detail="Availability slot overlaps with existing slot."
+            )
+        raise
+
     db.refresh(slot)
 
+    availability_index.slot_opened(doctor_id, slot.start_time, slot.end_time)
+
     return slot
 
 
@@ -56,13 +67,354 @@ def list_availability(
     db: Session,
     doctor_id: UUID,
     skip: int = 0,
-    limit: int = 20
-):
-    return (
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> tuple[list[AvailabilitySlot], Optional[str]]:
+    """
+    A doctor's slots ordered by (start_time, id).
+
+    Pass the returned cursor to fetch the next page without an offset;
+    `skip` is kept for existing clients.
+    """
+    query = (
         db.query(AvailabilitySlot)
         .filter(AvailabilitySlot.doctor_id == doctor_id)
-        .order_by(AvailabilitySlot.start_time)
-        .offset(skip)
-        .limit(limit)
+        .order_by(AvailabilitySlot.start_time, AvailabilitySlot.id)
+    )
+
+    if cursor:
+        start_time, slot_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        query = query.filter(
+            tuple_(AvailabilitySlot.start_time, AvailabilitySlot.id) > tuple_(start_time, slot_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    # fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.start_time.isoformat(), last.id)
+
+# -----------------------------
+# Open-slot search
+# -----------------------------
+
+@dataclass(frozen=True)
+class OpenSlotFilters:
+    start_from: Optional[datetime] = None  # defaults to now
+    start_to: Optional[datetime] = None
+    specialization: Optional[str] = None
+    min_fee: Optional[Decimal] = None
+    max_fee: Optional[Decimal] = None
+
+
+def build_open_slot_query(db: Session, filters: OpenSlotFilters):
+    """
+    Unbooked future slots across all doctors, ordered by (start_time, id).
+
+    The slot side is served by the partial index `ix_open_slots_start`;
+    the doctors table is only joined when a doctor filter is given.
+    """
+    query = db.query(AvailabilitySlot).options(
+        # only the response columns, all of them in the index
+        load_only(
+            AvailabilitySlot.id,
+            AvailabilitySlot.doctor_id,
+            AvailabilitySlot.start_time,
+            AvailabilitySlot.end_time,
+            AvailabilitySlot.is_booked,
+        )
+    ).filter(
+        # must match the ix_open_slots_start predicate literally
+        AvailabilitySlot.is_booked == false(),
+        AvailabilitySlot.start_time >= (filters.start_from or datetime.now(timezone.utc)),
+    )
+
+    if filters.start_to:
+        query = query.filter(AvailabilitySlot.start_time < filters.start_to)
+
+    if filters.specialization or filters.min_fee is not None or filters.max_fee is not None:
+        query = query.join(Doctor, Doctor.user_id == AvailabilitySlot.doctor_id)
+
+        if filters.specialization:
+            query = query.filter(Doctor.specialization == filters.specialization)
+
+        if filters.min_fee is not None:
+            query = query.filter(Doctor.consultation_fee >= filters.min_fee)
+
+        if filters.max_fee is not None:
+            query = query.filter(Doctor.consultation_fee <= filters.max_fee)
+
+    return query.order_by(AvailabilitySlot.start_time, AvailabilitySlot.id)
+
+
+def search_open_slots(
+    db: Session,
+    filters: OpenSlotFilters,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> tuple[list[AvailabilitySlot], Optional[str]]:
+    """
+    Keyset-paginated open-slot search.
+
+    Returns the page and an opaque cursor for the next page
+    (None when there are no more rows).
+    """
+    query = build_open_slot_query(db, filters)
+
+    if cursor:
+        start_time, slot_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        query = query.filter(
+            tuple_(AvailabilitySlot.start_time, AvailabilitySlot.id) > tuple_(start_time, slot_id)
+        )
+
+    # fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.start_time.isoformat(), last.id)
+
+
+# -----------------------------
+# Next free slot (bitmap index)
+# -----------------------------
+
+def next_free_slots(
+    db: Session,
+    doctor_id: UUID,
+    after: Optional[datetime] = None,
+    count: int = 1,
+) -> list[AvailabilitySlot]:
+    """
+    The `count` earliest unbooked slots of a doctor.
+
+    The bitmap index finds the start buckets in memory; the slots are
+    then read in one query bounded to exactly that time span.
+    """
+    after = after or datetime.now(timezone.utc)
+    starts = availability_index.next_free(db, doctor_id, after, count)
+    if not starts:
+        return []
+
+    return (
+        db.query(AvailabilitySlot)
+        .filter(
+            AvailabilitySlot.doctor_id == doctor_id,
+            AvailabilitySlot.is_booked == false(),
+            AvailabilitySlot.start_time >= max(starts[0], after),
+            AvailabilitySlot.start_time < starts[-1] + BUCKET,
+        )
+        .order_by(AvailabilitySlot.start_time, AvailabilitySlot.id)
+        .limit(count)
         .all()
     )
+
+# -----------------------------
+# Recurring schedules
+# -----------------------------
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _subtract(windows: list[tuple[int, int]], blocked: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Remove blocked minute ranges from the working windows.
+    """
+    for block_start, block_end in blocked:
+        remaining = []
+        for start, end in windows:
+            if block_end <= start or block_start >= end:
+                remaining.append((start, end))
+                continue
+            if start < block_start:
+                remaining.append((start, block_start))
+            if block_end < end:
+                remaining.append((block_end, end))
+        windows = remaining
+
+    return windows
+
+
+def _schedule_error(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=detail)
+
+
+def validate_schedule(payload: ScheduleCreate) -> ZoneInfo:
+    if payload.end_date < payload.start_date:
+        raise _schedule_error("Schedule end date must not be before start date.")
+
+    if (payload.end_date - payload.start_date).days >= settings.availability_schedule_max_days:
+        raise _schedule_error(
+            f"Schedule may span at most {settings.availability_schedule_max_days} days."
+        )
+
+    try:
+        tz = ZoneInfo(payload.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise _schedule_error("Unknown timezone.")
+
+    for item in [*payload.rules, *payload.breaks]:
+        if item.start >= item.end:
+            raise _schedule_error("Start time must be before end time.")
+
+    for exception in payload.exceptions:
+        if (exception.start is None) != (exception.end is None):
+            raise _schedule_error("Exceptions need both start and end, or neither.")
+        if exception.start is not None and exception.start >= exception.end:
+            raise _schedule_error("Start time must be before end time.")
+
+    by_weekday: dict[int, list[tuple[int, int]]] = {}
+    for rule in payload.rules:
+        by_weekday.setdefault(rule.weekday, []).append((_minutes(rule.start), _minutes(rule.end)))
+
+    for windows in by_weekday.values():
+        windows.sort()
+        if any(prev[1] > cur[0] for prev, cur in zip(windows, windows[1:])):
+            raise _schedule_error("Weekly rules overlap.")
+
+    return tz
+
+
+def expand_schedule(payload: ScheduleCreate, tz: ZoneInfo) -> list[tuple[datetime, datetime]]:
+    """
+    Expand the weekly rules into UTC (start, end) slot boundaries.
+
+    Slots are laid out in the doctor's local wall time; a slot that would
+    cross a break, an exception or a DST transition is left out.
+    """
+    rules: dict[int, list[tuple[int, int]]] = {}
+    for rule in payload.rules:
+        rules.setdefault(rule.weekday, []).append((_minutes(rule.start), _minutes(rule.end)))
+
+    exceptions: dict[date, list[tuple[int, int]]] = {}
+    for exception in payload.exceptions:
+        if exception.start is None:
+            blocked = (0, 24 * 60)
+        else:
+            blocked = (_minutes(exception.start), _minutes(exception.end))
+        exceptions.setdefault(exception.date, []).append(blocked)
+
+    length = payload.slot_minutes
+    slots = []
+
+    day = payload.start_date
+    while day <= payload.end_date:
+        weekday = day.weekday()
+        blocked = [
+            (_minutes(b.start), _minutes(b.end))
+            for b in payload.breaks
+            if b.weekday is None or b.weekday == weekday
+        ] + exceptions.get(day, [])
+
+        midnight = datetime(day.year, day.month, day.day)
+
+        for start, end in sorted(_subtract(rules.get(weekday, []), blocked)):
+            for offset in range(start, end - length + 1, length):
+                slot_start = (midnight + timedelta(minutes=offset)).replace(tzinfo=tz)
+                slot_end = (midnight + timedelta(minutes=offset + length)).replace(tzinfo=tz)
+
+                slot_start = slot_start.astimezone(timezone.utc)
+                slot_end = slot_end.astimezone(timezone.utc)
+
+                if slot_end - slot_start == timedelta(minutes=length):
+                    slots.append((slot_start, slot_end))
+
+        day += timedelta(days=1)
+
+    return slots
+
+
+def schedule_fingerprint(payload: ScheduleCreate) -> str:
+    data = payload.model_dump(mode="json")
+    for key in ("rules", "breaks", "exceptions"):
+        data[key] = sorted(data[key], key=lambda item: json.dumps(item, sort_keys=True))
+
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+# one statement per schedule; candidates overlapping the doctor's existing
+# slots hit ex_slot_no_overlap and are skipped by ON CONFLICT DO NOTHING
+INSERT_SCHEDULE_SLOTS = text("""
+    INSERT INTO availability_slots (id, doctor_id, schedule_id, start_time, end_time, is_booked)
+    SELECT gen_random_uuid(), :doctor_id, :schedule_id, c.start_time, c.end_time, false
+    FROM unnest(CAST(:starts AS timestamptz[]), CAST(:ends AS timestamptz[]))
+        AS c(start_time, end_time)
+    ON CONFLICT DO NOTHING
+""")
+
+
+def create_schedule(db: Session, doctor_id: UUID, payload: ScheduleCreate) -> dict:
+    """
+    Store the schedule and expand it into slots.
+
+    Re-submitting the same schedule is a no-op: the schedule row is keyed
+    by a fingerprint and slots that already exist are skipped.
+    """
+    tz = validate_schedule(payload)
+    candidates = expand_schedule(payload, tz)
+
+    if len(candidates) > settings.availability_schedule_max_slots:
+        raise _schedule_error(
+            f"Schedule expands to more than {settings.availability_schedule_max_slots} slots."
+        )
+
+    fingerprint = schedule_fingerprint(payload)
+
+    schedule_id = db.execute(
+        insert(AvailabilitySchedule)
+        .values(
+            doctor_id=doctor_id,
+            fingerprint=fingerprint,
+            timezone=payload.timezone,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            slot_minutes=payload.slot_minutes,
+            definition=payload.model_dump(mode="json"),
+        )
+        .on_conflict_do_nothing(constraint="uq_schedule_fingerprint")
+        .returning(AvailabilitySchedule.id)
+    ).scalar()
+
+    if schedule_id is None:
+        schedule_id = db.execute(
+            select(AvailabilitySchedule.id).where(
+                AvailabilitySchedule.doctor_id == doctor_id,
+                AvailabilitySchedule.fingerprint == fingerprint,
+            )
+        ).scalar_one()
+
+    created = 0
+    if candidates:
+        created = db.execute(INSERT_SCHEDULE_SLOTS, {
+            "doctor_id": doctor_id,
+            "schedule_id": schedule_id,
+            "starts": [start for start, _ in candidates],
+            "ends": [end for _, end in candidates],
+        }).rowcount
+
+    db.commit()
+
+    if created:
+        # local wall-clock days may straddle UTC days on either side
+        availability_index.invalidate(
+            doctor_id,
+            payload.start_date - timedelta(days=1),
+            payload.end_date + timedelta(days=1),
+        )
+
+    return {
+        "schedule_id": schedule_id,
+        "created": created,
+        "skipped": len(candidates) - created,
+    }
@@ -1,41 +1,40 @@
 from fastapi import APIRouter, Depends, Header, HTTPException, status, Response
-from sqlalchemy.orm import Session
 from uuid import UUID
 from fastapi import BackgroundTasks
-from app.api.deps import get_db
+from app.api.deps import DbSession, get_session, run_db
+from app.core.rate_limiter import limiter
 from app.modules.auth.dependencies import get_current_user
 from app.modules.bookings.schemas import BookingCreate, BookingResponse
 from app.modules.bookings.services import create_booking
 from app.modules.bookings.tasks import send_booking_notification
-from app.modules.consultations.models import Consultation
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
 
-@router.post("/", response_model=BookingResponse)
-def book_slot(
+@router.post(
+    "/",
+    response_model=BookingResponse,
+    dependencies=[Depends(limiter.limit("bookings"))],
+)
+async def book_slot(
     payload: BookingCreate,
     response: Response,
     background_tasks: BackgroundTasks,
     idempotency_key: str = Header(...),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     current_user = Depends(get_current_user),
 ):
     if current_user.role != "patient":
         raise HTTPException(status_code=403, detail="Only patients can book")
 
-    booking, created = create_booking(
-        db=db,
+    booking, created = await run_db(
+        db,
+        create_booking,
         patient_id=current_user.id,
         slot_id=payload.slot_id,
         idempotency_key=idempotency_key
     )
 
-    # Get consultation for status
-    consultation = db.query(Consultation).filter(
-        Consultation.id == booking.consultation_id
-    ).first()
-
     if created:
         response.status_code = status.HTTP_201_CREATED
 
@@ -43,13 +42,8 @@ def book_slot(
         background_tasks.add_task(
             send_booking_notification,
             current_user.email,
-            str(consultation.id)
+            str(booking.consultation_id)
         )
 
-    return BookingResponse(
-        id=booking.id,
-        slot_id=booking.slot_id,
-        doctor_id=booking.doctor_id,
-        status=consultation.status,
-        consultation_id = consultation.id
-    )
\ No newline at end of file
+    # built from the rows the booking statement returned
+    return BookingResponse.model_validate(booking)
\ No newline at end of file
@@ -1,12 +1,130 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from fastapi import HTTPException
 from uuid import UUID
 
-from app.modules.bookings.models import Booking
-from app.modules.availability.models import AvailabilitySlot
-from app.modules.consultations.models import Consultation
-from app.modules.audit.models import AuditLog
+from app.core.config import settings
+from app.core.metrics import BOOKING_LOCK_OUTCOMES, BOOKING_LOCK_WAIT_SECONDS
+from app.modules.availability.bitmap import availability_index
+
+
+# SQLSTATE lock_not_available, raised by FOR UPDATE NOWAIT
+LOCK_NOT_AVAILABLE = "55P03"
+
+LOCK_STRATEGIES = ("blocking", "nowait", "advisory")
+
+# how the slot row is claimed, spliced into BOOKING_SQL
+LOCK_CLAUSES = {
+    "blocking": ("TRUE", "FOR UPDATE"),
+    "nowait": ("TRUE", "FOR UPDATE NOWAIT"),
+    "advisory": (
+        "pg_try_advisory_xact_lock(hashtextextended('slot:' || CAST(:slot_id AS text), 0))",
+        "FOR UPDATE",
+    ),
+}
+
+# One round trip for the whole booking: replay an existing booking for the
+# idempotency key, or claim the slot and write consultation, booking and
+# audit row. Empty result = slot missing, taken or locked.
+BOOKING_SQL = """
+    WITH existing AS (
+        SELECT b.id, b.slot_id, b.doctor_id, b.consultation_id
+        FROM bookings b
+        WHERE b.idempotency_key = :idempotency_key
+    ),
+    gate AS (
+        SELECT {gate} AS acquired
+    ),
+    locked AS (
+        SELECT s.id
+        FROM availability_slots s
+        WHERE s.id = :slot_id
+          AND s.is_booked = false
+          AND NOT EXISTS (SELECT 1 FROM existing)
+          AND (SELECT acquired FROM gate)
+        {lock}
+    ),
+    slot AS (
+        UPDATE availability_slots s
+        SET is_booked = true, updated_at = now()
+        FROM locked
+        WHERE s.id = locked.id
+        RETURNING s.id, s.doctor_id, s.start_time, s.end_time
+    ),
+    consultation AS (
+        INSERT INTO consultations (id, patient_id, doctor_id, slot_id, status, created_at, updated_at)
+        SELECT gen_random_uuid(), :patient_id, slot.doctor_id, slot.id, 'scheduled', now(), now()
+        FROM slot
+        RETURNING id, slot_id, status
+    ),
+    booking AS (
+        INSERT INTO bookings (id, patient_id, doctor_id, slot_id, consultation_id, idempotency_key)
+        SELECT gen_random_uuid(), :patient_id, slot.doctor_id, slot.id, consultation.id, :idempotency_key
+        FROM slot JOIN consultation ON consultation.slot_id = slot.id
+        RETURNING id, slot_id, doctor_id, consultation_id
+    ),
+    audit AS (
+        INSERT INTO audit_logs (id, user_id, action, entity_type, entity_id, event_data, created_at)
+        SELECT gen_random_uuid(), :patient_id, 'BOOKING_CREATED', 'consultation',
+               CAST(consultation.id AS text), 'slot_id=' || CAST(consultation.slot_id AS text), now()
+        FROM consultation
+    )
+    SELECT true AS created, booking.id, booking.slot_id, booking.doctor_id,
+           booking.consultation_id, consultation.status, slot.start_time, slot.end_time
+    FROM booking
+    JOIN consultation ON consultation.id = booking.consultation_id
+    JOIN slot ON slot.id = booking.slot_id
+    UNION ALL
+    SELECT false, existing.id, existing.slot_id, existing.doctor_id,
+           existing.consultation_id, c.status, NULL, NULL
+    FROM existing
+    JOIN consultations c ON c.id = existing.consultation_id
+"""
+
+BOOKING_STATEMENTS = {
+    strategy: text(BOOKING_SQL.format(gate=gate, lock=lock))
+    for strategy, (gate, lock) in LOCK_CLAUSES.items()
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BookingResult:
+    id: UUID
+    slot_id: UUID
+    doctor_id: UUID
+    consultation_id: UUID
+    status: str  # from Consultation
+
+
+def _slot_busy(strategy: str) -> HTTPException:
+    BOOKING_LOCK_OUTCOMES.labels(strategy=strategy, outcome="conflict").inc()
+    return HTTPException(status_code=409, detail="Slot is being booked, try again")
+
+
+def _execute_booking(db: Session, strategy: str, params: dict):
+    for attempt in range(2):
+        try:
+            row = db.execute(BOOKING_STATEMENTS[strategy], params).first()
+            db.commit()
+            return row
+
+        except IntegrityError:
+            db.rollback()
+            # a concurrent request with the same idempotency key won;
+            # running again replays its booking
+            if attempt:
+                raise HTTPException(status_code=409, detail="Slot already booked")
+
+        except DBAPIError as exc:
+            db.rollback()
+            # OperationalError with psycopg2, plain DBAPIError with asyncpg
+            if getattr(exc.orig, "pgcode", None) == LOCK_NOT_AVAILABLE:
+                raise _slot_busy(strategy)
+            raise
 
 
 def create_booking(
@@ -15,94 +133,55 @@ def create_booking(
     patient_id: UUID,
     slot_id: UUID,
     idempotency_key: str
-):
+) -> tuple[BookingResult, bool]:
     """
     Production-grade booking creation:
     - Idempotent
-    - Concurrency safe
-    - Fully atomic
+    - Concurrency safe (slot claimed per `booking_lock_strategy`)
+    - Fully atomic, one statement and a commit
     - Audit logged
     """
+    strategy = settings.booking_lock_strategy
+    if strategy not in BOOKING_STATEMENTS:
+        raise ValueError(f"Unknown booking lock strategy: {strategy}")
+
+    params = {
+        "patient_id": patient_id,
+        "slot_id": slot_id,
+        "idempotency_key": idempotency_key,
+    }
 
+    started = time.perf_counter()
     try:
+        row = _execute_booking(db, strategy, params)
+    finally:
+        # statement time, including any wait for the slot lock
+        BOOKING_LOCK_WAIT_SECONDS.labels(strategy=strategy).observe(time.perf_counter() - started)
+
+    if row is None:
+        # failure path only: tell missing, taken and locked apart
+        is_booked = db.execute(
+            text("SELECT is_booked FROM availability_slots WHERE id = :slot_id"),
+            {"slot_id": slot_id},
+        ).scalar()
+        db.rollback()
 
-        # --- 1. Check idempotency ---
-        existing = (
-            db.query(Booking)
-            .filter(Booking.idempotency_key == idempotency_key)
-            .first()
-        )
-
-        if existing:
-            return existing, False
-
-        # --- 2. Lock Slot Row (CRITICAL) ---
-        slot = (
-            db.query(AvailabilitySlot)
-            .filter(AvailabilitySlot.id == slot_id)
-            .with_for_update()  # row-level lock
-            .first()
-        )
-
-        if not slot:
+        if is_booked is None:
             raise HTTPException(status_code=404, detail="Slot not found")
-
-        if slot.is_booked:
+        if is_booked:
             raise HTTPException(status_code=409, detail="Slot already booked")
+        raise _slot_busy(strategy)
 
-        # --- 3. Create Consultation ---
-        consultation = Consultation(
-            patient_id=patient_id,
-            doctor_id=slot.doctor_id,
-            slot_id=slot.id,
-            status="scheduled"
-        )
-        db.add(consultation)
-        db.flush()  # generate consultation.id
-
-        # --- 4. Create Booking (Idempotency Tracker) ---
-        booking = Booking(
-            patient_id=patient_id,
-            doctor_id=slot.doctor_id,
-            slot_id=slot.id,
-            consultation_id=consultation.id,
-            idempotency_key=idempotency_key
-        )
-        db.add(booking)
-
-        # --- 5. Mark Slot Booked ---
-        slot.is_booked = True
-
-        # --- 6. Audit Log ---
-        audit = AuditLog(
-            user_id=patient_id,
-            action="BOOKING_CREATED",
-            entity_type="consultation",
-            entity_id=str(consultation.id),
-            event_data=f"slot_id={slot.id}"
-        )
-        db.add(audit)
-
-        # --- 7. Commit (Single Atomic Commit) ---
-        db.commit()
-        db.refresh(booking)
-
-        return booking, True
-
-    except IntegrityError:
-        db.rollback()
-
-        # Handle race condition on idempotency key
-        existing = (
-            db.query(Booking)
-            .filter(Booking.idempotency_key == idempotency_key)
-            .first()
-        )
-        if existing:
-            return existing, False
+    result = BookingResult(
+        id=row.id,
+        slot_id=row.slot_id,
+        doctor_id=row.doctor_id,
+        consultation_id=row.consultation_id,
+        status=row.status,
+    )
 
-        raise HTTPException(status_code=409, detail="Slot already booked")
+    if row.created:
+        BOOKING_LOCK_OUTCOMES.labels(strategy=strategy, outcome="acquired").inc()
+        availability_index.slot_closed(row.doctor_id, row.start_time, row.end_time)
 
-    except Exception:
-        db.rollback()
-        raise
\ No newline at end of file
+    return result, row.created
@@ -17,15 +17,13 @@ class Consultation(Base):
     patient_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id"), 
-        nullable=False, 
-        index=True
+        nullable=False
     )
 
     doctor_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("users.id"), 
-        nullable=False, 
-        index=True
+        nullable=False
     )
 
     slot_id = Column(
@@ -57,5 +55,9 @@ class Consultation(Base):
 
     __table_args__ = (
         Index("idx_consultation_status", "status"),
+        # keyset search, newest first, per role scope
+        Index("idx_consultation_patient_created_id", "patient_id", "created_at", "id"),
+        Index("idx_consultation_doctor_created_id", "doctor_id", "created_at", "id"),
+        Index("idx_consultation_created_id", "created_at", "id"),
         Index("unique_active_slot_booking","slot_id", unique=True, postgresql_where=(status != "cancelled")),
     )
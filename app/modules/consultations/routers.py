@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response
 from uuid import UUID
 
-from app.api.deps import get_db
-from app.modules.auth.dependencies import get_current_user
-from app.modules.users.models import User
+from app.api.deps import DbSession, get_session, run_db
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.modules.auth.dependencies import get_current_claims, get_current_user
+from app.modules.auth.principal import Claims, Principal
 
 from datetime import datetime
 from typing import Optional
@@ -17,26 +17,28 @@ router = APIRouter(prefix="/consultations", tags=["Consultations"])
 
 
 @router.get("/my", response_model=list[ConsultationResponse])
-def get_my_consultations(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_my_consultations(
+    db: DbSession = Depends(get_session),
+    current_user: Claims = Depends(get_current_claims),
 ):
-    return get_user_consultations(
-        db=db,
+    return await run_db(
+        db,
+        get_user_consultations,
         user_id=current_user.id,
         role=current_user.role
     )
 
 
 @router.patch("/{consultation_id}/status", response_model=ConsultationResponse)
-def change_status(
+async def change_status(
     consultation_id: UUID,
     payload: ConsultationStatusUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return update_consultation_status(
-        db=db,
+    return await run_db(
+        db,
+        update_consultation_status,
         consultation_id=consultation_id,
         new_status=payload.status,
         user_id=current_user.id,
@@ -45,19 +47,22 @@ def change_status(
 
 
 @router.get("/search", response_model=list[ConsultationResponse])
-def search(
+async def search(
+    response: Response,
     doctor_id: Optional[UUID] = None,
     patient_id: Optional[UUID] = None,
     status: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
     page: int = Query(1, ge=1),
-    limit: int = Query(20, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_session),
+    current_user: Claims = Depends(get_current_claims),
 ):
-    return search_consultations(
-        db=db,
+    consultations, next_cursor = await run_db(
+        db,
+        search_consultations,
         current_user=current_user,
         doctor_id=doctor_id,
         patient_id=patient_id,
@@ -66,4 +71,10 @@ def search(
         date_to=date_to,
         page=page,
         limit=limit,
-    )
\ No newline at end of file
+        cursor=cursor,
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return consultations
\ No newline at end of file
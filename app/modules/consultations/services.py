@@ -1,13 +1,15 @@
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from uuid import UUID
 
 from typing import Optional, List
 from datetime import datetime
+from app.core.pagination import decode_cursor, encode_cursor
 from app.modules.audit.models import AuditLog
 
 from app.modules.consultations.models import Consultation
-from app.modules.users.models import User
+from app.modules.auth.principal import Claims
 
 
 VALID_TRANSITIONS = {
@@ -16,6 +18,12 @@ VALID_TRANSITIONS = {
     "cancelled": [],
 }
 
+def get_consultation(db: Session, consultation_id: UUID) -> Optional[Consultation]:
+    return db.query(Consultation).filter(
+        Consultation.id == consultation_id
+    ).first()
+
+
 def get_user_consultations(db: Session, user_id: UUID, role: str):
     if role == "patient":
         return db.query(Consultation).filter(
@@ -82,7 +90,7 @@ def update_consultation_status(
 
 def search_consultations(
     db: Session,
-    current_user: User,
+    current_user: Claims,
     doctor_id: Optional[UUID] = None,
     patient_id: Optional[UUID] = None,
     status: Optional[str] = None,
@@ -90,10 +98,15 @@ def search_consultations(
     date_to: Optional[datetime] = None,
     page: int = 1,
     limit: int = 20,
-) -> List[Consultation]:
+    cursor: Optional[str] = None,
+) -> tuple[List[Consultation], Optional[str]]:
     """
     Secure consultation search with strict RBAC and pagination.
 
+    Returns the page and an opaque cursor for the next page (None when
+    there are no more rows). Passing the cursor back pages by
+    (created_at, id) instead of `page`, so deep pages stay cheap.
+
     Role Rules:
     - patient → can ONLY see their own consultations
     - doctor  → can ONLY see their own consultations
@@ -143,11 +156,25 @@ def search_consultations(
     # -------------------------------
     # ORDERING
     # -------------------------------
-    query = query.order_by(Consultation.created_at.desc())
+    query = query.order_by(Consultation.created_at.desc(), Consultation.id.desc())
 
     # -------------------------------
     # PAGINATION
     # -------------------------------
-    offset = (page - 1) * limit
+    if cursor:
+        created_at, consultation_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        query = query.filter(
+            tuple_(Consultation.created_at, Consultation.id) < tuple_(created_at, consultation_id)
+        )
+    else:
+        query = query.offset((page - 1) * limit)
+
+    # fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
 
-    return query.offset(offset).limit(limit).all()
\ No newline at end of file
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at.isoformat(), last.id)
\ No newline at end of file
@@ -1,7 +1,8 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.deps import DbSession, get_db, get_session, run_db
+from app.core.rate_limiter import limiter
 from app.modules.auth.dependencies import get_current_user
 from app.modules.payments.schemas import (
     PaymentCreate,
@@ -9,7 +10,7 @@ from app.modules.payments.schemas import (
     PaymentWebhookUpdate
 )
 from app.modules.payments.services import PaymentService
-from app.modules.users.models import User
+from app.modules.auth.principal import Principal
 
 
 router = APIRouter(
@@ -18,19 +19,27 @@ router = APIRouter(
 )
 
 
-@router.post("/", response_model=PaymentResponse, status_code=201)
-def create_payment(
+@router.post(
+    "/",
+    response_model=PaymentResponse,
+    status_code=201,
+    dependencies=[Depends(limiter.limit("payments"))],
+)
+async def create_payment(
     payload: PaymentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user)
 ):
-    return PaymentService.create_payment(
+    return await run_db(
         db,
+        PaymentService.create_payment,
         patient_id=current_user.id,
         data=payload
     )
 
 
+# stays on a sync session: the retry backoff sleeps, which must not
+# happen on the event loop
 @router.post("/webhook", response_model=PaymentResponse)
 def webhook_update(
     payload: PaymentWebhookUpdate,
@@ -45,13 +54,14 @@ def webhook_update(
 
 
 @router.post("/{payment_id}/refund", response_model=PaymentResponse)
-def refund_payment(
+async def refund_payment(
     payment_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user)
 ):
-    return PaymentService.refund_payment(
-        db=db,
+    return await run_db(
+        db,
+        PaymentService.refund_payment,
         payment_id=payment_id,
         current_user=current_user
     )
\ No newline at end of file
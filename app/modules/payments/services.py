@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from app.core.retry import retry_with_backoff
 from app.modules.consultations.models import Consultation
 from app.modules.payments.models import Payment, PaymentStatus
-from app.modules.users.models import User
+from app.modules.auth.principal import Principal
 
 
 class PaymentService:
@@ -143,7 +143,7 @@ class PaymentService:
         db: Session,
         *,
         payment_id: uuid.UUID,
-        current_user: User
+        current_user: Principal
     ):
         payment = db.query(Payment).filter(
             Payment.id == payment_id
@@ -1,27 +1,26 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.modules.auth.dependencies import get_current_user
-from app.modules.users.models import User
-from .models import Prescription
+from app.api.deps import DbSession, get_session, run_db
+from app.modules.auth.dependencies import get_current_claims, get_current_user
+from app.modules.auth.principal import Claims, Principal
 from .schemas import PrescriptionCreate, PrescriptionResponse
-from .services import create_prescription
+from .services import create_prescription, list_prescriptions
 
 router = APIRouter(prefix="/prescriptions", tags=["Prescriptions"])
 
 
 @router.post("/", response_model=PrescriptionResponse)
-def write_prescription(
+async def write_prescription(
     payload: PrescriptionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "doctor":
         raise Exception("Only doctors can write prescriptions")
 
-    return create_prescription(
-        db=db,
+    return await run_db(
+        db,
+        create_prescription,
         consultation_id=payload.consultation_id,
         doctor_id=current_user.id,
         notes=payload.notes,
@@ -29,20 +28,8 @@ def write_prescription(
 
 
 @router.get("/my", response_model=list[PrescriptionResponse])
-def get_my_prescriptions(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_my_prescriptions(
+    db: DbSession = Depends(get_session),
+    current_user: Claims = Depends(get_current_claims),
 ):
-    # Patient → see their prescriptions
-    if current_user.role == "patient":
-        return db.query(Prescription).filter(
-            Prescription.patient_id == current_user.id
-        ).all()
-
-    # Doctor → see prescriptions they wrote
-    if current_user.role == "doctor":
-        return db.query(Prescription).filter(
-            Prescription.doctor_id == current_user.id
-        ).all()
-
-    return []
\ No newline at end of file
+    return await run_db(db, list_prescriptions, current_user.id, current_user.role)
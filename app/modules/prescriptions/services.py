@@ -44,3 +44,19 @@ def create_prescription(
     db.refresh(prescription)
 
     return prescription
+
+
+def list_prescriptions(db: Session, user_id: UUID, role: str):
+    # Patient → see their prescriptions
+    if role == "patient":
+        return db.query(Prescription).filter(
+            Prescription.patient_id == user_id
+        ).all()
+
+    # Doctor → see prescriptions they wrote
+    if role == "doctor":
+        return db.query(Prescription).filter(
+            Prescription.doctor_id == user_id
+        ).all()
+
+    return []
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean, DateTime
+from sqlalchemy import String, Boolean, DateTime, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -43,6 +43,14 @@ class User(Base, BaseModelMixin):
         default=True
     )
 
+    # bumped to revoke every access token issued before the change
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        server_default="0",
+        default=0,
+        nullable=False
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from app.modules.users.models import User
 from app.modules.auth.dependencies import get_current_user
+from app.modules.auth.principal import Principal
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
@@ -8,15 +9,21 @@ from app.api.deps import get_db
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("/me")
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # the principal only carries auth fields; load the full profile
+    user = db.query(User).filter(User.id == current_user.id).first()
+
     return {
-        "id": current_user.id,
-        "email": current_user.email,
-        "role": current_user.role,
-        "is_active": current_user.is_active,
-        "mfa_enabled": current_user.mfa_enabled,
-        "created_at": current_user.created_at,
-        "updated_at": current_user.updated_at
+        "id": user.id,
+        "email": user.email,
+        "role": user.role,
+        "is_active": user.is_active,
+        "mfa_enabled": user.mfa_enabled,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at
     }
 
 @router.get("/doctors")
@@ -0,0 +1,105 @@
+"""
+Throughput of DB-bound routes: AsyncSession vs. sync sessions in the threadpool.
+
+Seeds one doctor with slots, then has N concurrent clients hammer
+`GET /availability/doctor/{id}` through the ASGI app, once with
+`db_async` on and once off (sync route bodies run in the anyio
+threadpool, capped at 40 threads).
+
+    python -m benchmarks.bench_async_db --clients 500 --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import SessionLocal, async_engine, engine
+from app.main import app
+from app.modules.availability.models import AvailabilitySlot
+from app.modules.users.models import User
+
+
+def seed(slots: int) -> uuid.UUID:
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    doctor = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="-", role="doctor")
+    db.add(doctor)
+    db.flush()
+
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    db.add_all(
+        AvailabilitySlot(
+            doctor_id=doctor.id,
+            start_time=base + timedelta(minutes=30 * i),
+            end_time=base + timedelta(minutes=30 * i + 30),
+        )
+        for i in range(slots)
+    )
+    db.commit()
+
+    doctor_id = doctor.id
+    db.close()
+    return doctor_id
+
+
+async def measure(mode: str, path: str, clients: int, requests: int) -> dict:
+    settings.db_async = mode == "async"
+
+    remaining = iter(range(requests))
+    timings = []
+
+    async def client_loop(client: AsyncClient):
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm-up
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "mode": mode,
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 2),
+    }
+
+
+async def run(clients: int, requests: int):
+    doctor_id = seed(50)
+    path = f"/availability/doctor/{doctor_id}?limit=20"
+
+    for mode in ("sync", "async"):
+        print(await measure(mode, path, clients, requests))
+
+    await async_engine.dispose()
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Request latency of token-claims authorization vs. a per-request user lookup.
+
+Serves two identical endpoints from a throwaway app: one authorizes from
+the JWT claims alone, the other loads the user from the DB on every call
+(principal cache cleared, i.e. the pre-cache behaviour).
+
+    python -m benchmarks.bench_auth_claims --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.security import create_user_access_token, get_password_hash
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.modules.auth.dependencies import get_current_claims, get_current_user
+from app.modules.auth.principal import principal_cache
+from app.modules.users.models import User
+
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/claims")
+def with_claims(current_user=Depends(get_current_claims)):
+    return {"id": str(current_user.id)}
+
+
+@bench_app.get("/db")
+def with_db_lookup(current_user=Depends(get_current_user)):
+    principal_cache.clear()
+    return {"id": str(current_user.id)}
+
+
+def create_user() -> User:
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    user = User(
+        email=f"bench-{uuid.uuid4()}@example.com",
+        password_hash=get_password_hash("benchmark"),
+        role="patient",
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.close()
+    return user
+
+
+async def measure(client: AsyncClient, path: str, headers: dict, requests: int) -> dict:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+
+    timings.sort()
+    return {
+        "path": path,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+async def run(requests: int):
+    user = create_user()
+    headers = {"Authorization": f"Bearer {create_user_access_token(user)}"}
+
+    transport = ASGITransport(app=bench_app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/claims", "/db"):
+            await measure(client, path, headers, 50)  # warm-up
+            print(await measure(client, path, headers, requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
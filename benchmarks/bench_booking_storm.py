@@ -0,0 +1,134 @@
+"""
+Booking storm: N patients hit one freshly opened slot at once.
+
+Runs each slot lock strategy (blocking, nowait, advisory) against its
+own slot and reports latency percentiles, status codes and the peak
+number of pooled DB connections checked out during the storm.
+
+    python -m benchmarks.bench_booking_storm --clients 200
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limiter import limiter
+from app.core.security import create_user_access_token
+from app.db.base import Base
+from app.db.session import SessionLocal, async_engine, engine
+from app.main import app
+from app.modules.availability.models import AvailabilitySlot
+from app.modules.bookings.services import LOCK_STRATEGIES
+from app.modules.users.models import User
+
+
+def seed(clients: int) -> tuple[uuid.UUID, list[str]]:
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    doctor = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="-", role="doctor")
+    patients = [
+        User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="-", role="patient")
+        for _ in range(clients)
+    ]
+    db.add_all([doctor, *patients])
+    db.commit()
+
+    tokens = [create_user_access_token(patient) for patient in patients]
+    doctor_id = doctor.id
+    db.close()
+    return doctor_id, tokens
+
+
+def open_slot(doctor_id: uuid.UUID, offset: int) -> str:
+    db = SessionLocal()
+    start_time = datetime(2031, 1, 1, tzinfo=timezone.utc) + timedelta(hours=offset)
+    slot = AvailabilitySlot(
+        doctor_id=doctor_id,
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=30),
+    )
+    db.add(slot)
+    db.commit()
+    slot_id = str(slot.id)
+    db.close()
+    return slot_id
+
+
+def percentile(timings: list[float], p: float) -> float:
+    return round(timings[max(0, int(len(timings) * p) - 1)], 2)
+
+
+async def storm(client: AsyncClient, strategy: str, slot_id: str, tokens: list[str]) -> dict:
+    settings.booking_lock_strategy = strategy
+    pool = (async_engine.sync_engine if settings.db_async else engine).pool
+
+    timings, statuses, peak = [], Counter(), 0
+    done = asyncio.Event()
+
+    async def sample_pool():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, pool.checkedout())
+            await asyncio.sleep(0.001)
+
+    async def book(token: str):
+        started = time.perf_counter()
+        response = await client.post(
+            "/bookings/",
+            json={"slot_id": slot_id},
+            headers={
+                "Authorization": f"Bearer {token}",
+                "idempotency-key": f"{strategy}-{token[-16:]}",
+            },
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+        statuses[response.status_code] += 1
+
+    sampler = asyncio.create_task(sample_pool())
+    await asyncio.gather(*(book(token) for token in tokens))
+    done.set()
+    await sampler
+
+    timings.sort()
+    return {
+        "strategy": strategy,
+        "p50_ms": percentile(timings, 0.50),
+        "p95_ms": percentile(timings, 0.95),
+        "p99_ms": percentile(timings, 0.99),
+        "statuses": dict(statuses),
+        "peak_pool_checked_out": peak,
+    }
+
+
+async def run(clients: int):
+    limiter.enabled = False
+    doctor_id, tokens = seed(clients)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for offset, strategy in enumerate(LOCK_STRATEGIES):
+            print(await storm(client, strategy, open_slot(doctor_id, offset), tokens))
+
+    await async_engine.dispose()
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.clients))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Deep-page latency: offset vs. keyset pagination.
+
+Seeds one doctor with N slots and N consultations, then fetches a page
+at increasing depths through `list_availability` and
+`search_consultations`, once by offset and once by cursor. Offset
+latency grows with depth; cursor latency stays flat.
+
+    python -m benchmarks.bench_deep_pagination --rows 100000
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.core.pagination import encode_cursor
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.modules.auth.principal import Claims
+from app.modules.availability.services import list_availability
+from app.modules.consultations.services import search_consultations
+from app.modules.users.models import User
+
+
+PAGE_SIZE = 20
+
+
+def seed(rows: int) -> uuid.UUID:
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    doctor = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="-", role="doctor")
+    patient = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="-", role="patient")
+    db.add_all([doctor, patient])
+    db.flush()
+
+    db.execute(text("""
+        INSERT INTO availability_slots (id, doctor_id, start_time, end_time, is_booked)
+        SELECT gen_random_uuid(), :doctor_id,
+               timestamptz '2030-01-01' + n * interval '15 minutes',
+               timestamptz '2030-01-01' + (n + 1) * interval '15 minutes',
+               true
+        FROM generate_series(0, :rows - 1) AS n
+    """), {"doctor_id": doctor.id, "rows": rows})
+
+    db.execute(text("""
+        INSERT INTO consultations (id, patient_id, doctor_id, slot_id, status, created_at, updated_at)
+        SELECT gen_random_uuid(), :patient_id, :doctor_id, s.id, 'scheduled', s.start_time, s.start_time
+        FROM availability_slots s
+        WHERE s.doctor_id = :doctor_id
+    """), {"doctor_id": doctor.id, "patient_id": patient.id})
+
+    db.commit()
+    db.execute(text("ANALYZE availability_slots"))
+    db.execute(text("ANALYZE consultations"))
+    db.commit()
+
+    doctor_id = doctor.id
+    db.close()
+    return doctor_id
+
+
+def timed(fn, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def cursor_at(db, sql: str, doctor_id: uuid.UUID, depth: int) -> str:
+    sort_value, row_id = db.execute(
+        text(sql), {"doctor_id": doctor_id, "offset": depth - 1}
+    ).one()
+    return encode_cursor(sort_value.isoformat(), row_id)
+
+
+def run(rows: int):
+    doctor_id = seed(rows)
+    claims = Claims(id=doctor_id, role="doctor", token_version=0)
+
+    db = SessionLocal()
+
+    for depth in (PAGE_SIZE, rows // 4, rows // 2, rows - PAGE_SIZE):
+        slot_cursor = cursor_at(db, """
+            SELECT start_time, id FROM availability_slots WHERE doctor_id = :doctor_id
+            ORDER BY start_time, id OFFSET :offset LIMIT 1
+        """, doctor_id, depth)
+
+        consultation_cursor = cursor_at(db, """
+            SELECT created_at, id FROM consultations WHERE doctor_id = :doctor_id
+            ORDER BY created_at DESC, id DESC OFFSET :offset LIMIT 1
+        """, doctor_id, depth)
+
+        print({
+            "depth": depth,
+            "slots_offset_ms": timed(lambda: list_availability(
+                db, doctor_id, skip=depth, limit=PAGE_SIZE)),
+            "slots_cursor_ms": timed(lambda: list_availability(
+                db, doctor_id, limit=PAGE_SIZE, cursor=slot_cursor)),
+            "search_offset_ms": timed(lambda: search_consultations(
+                db, claims, page=depth // PAGE_SIZE + 1, limit=PAGE_SIZE)),
+            "search_cursor_ms": timed(lambda: search_consultations(
+                db, claims, limit=PAGE_SIZE, cursor=consultation_cursor)),
+        })
+
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Login throughput of the password hashing pool.
+
+Verifies a bcrypt_sha256 hash with N concurrent callers and reports
+logins per second, overall and per worker process (≈ per core).
+
+    python -m benchmarks.bench_password_hashing --logins 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from fastapi import HTTPException
+
+from app.core.security import PasswordHasher, get_password_hash
+
+
+async def run(logins: int, concurrency: int, workers: int) -> dict:
+    hasher = PasswordHasher(max_workers=workers, max_pending=concurrency)
+    hashed = get_password_hash("benchmark-password")
+
+    # warm the pool so process start-up is not measured
+    await asyncio.gather(*(
+        hasher.verify_and_update("benchmark-password", hashed) for _ in range(workers)
+    ))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await hasher.verify_and_update("benchmark-password", hashed)
+            except HTTPException:
+                rejected += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    hasher.shutdown()
+
+    throughput = (logins - rejected) / elapsed
+    return {
+        "workers": workers,
+        "logins": logins,
+        "rejected": rejected,
+        "seconds": round(elapsed, 2),
+        "logins_per_second": round(throughput, 1),
+        "logins_per_second_per_core": round(throughput / workers, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(asyncio.run(run(args.logins, args.concurrency, args.workers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Slot creation latency: exclusion constraint vs. read-then-insert.
+
+Creates non-overlapping slots for one doctor with both paths:
+
+- `constraint`: `create_availability`, a single INSERT guarded by
+  ex_slot_no_overlap
+- `two-query`: the previous overlap SELECT followed by the INSERT
+
+    python -m benchmarks.bench_slot_insert --slots 2000
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.modules.availability.models import AvailabilitySlot
+from app.modules.availability.services import create_availability
+from app.modules.users.models import User
+
+
+def create_doctor() -> uuid.UUID:
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    doctor = User(
+        email=f"bench-{uuid.uuid4()}@example.com",
+        password_hash="-",
+        role="doctor",
+    )
+    db.add(doctor)
+    db.commit()
+    doctor_id = doctor.id
+    db.close()
+    return doctor_id
+
+
+def create_two_query(db, doctor_id, start_time, end_time):
+    overlapping = db.query(AvailabilitySlot).filter(
+        AvailabilitySlot.doctor_id == doctor_id,
+        AvailabilitySlot.start_time < end_time,
+        AvailabilitySlot.end_time > start_time
+    ).first()
+
+    if overlapping:
+        raise HTTPException(status_code=400, detail="overlap")
+
+    slot = AvailabilitySlot(doctor_id=doctor_id, start_time=start_time, end_time=end_time)
+    db.add(slot)
+    db.commit()
+    db.refresh(slot)
+    return slot
+
+
+def measure(name: str, create, slots: int, base: datetime) -> dict:
+    doctor_id = create_doctor()
+    db = SessionLocal()
+
+    timings = []
+    for i in range(slots):
+        start_time = base + timedelta(minutes=15 * i)
+        started = time.perf_counter()
+        create(db, doctor_id, start_time, start_time + timedelta(minutes=15))
+        timings.append((time.perf_counter() - started) * 1000)
+
+    db.close()
+
+    timings.sort()
+    return {
+        "path": name,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slots", type=int, default=2000)
+    args = parser.parse_args()
+
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    for name, create in (("constraint", create_availability), ("two-query", create_two_query)):
+        print(measure(name, create, args.slots, base))
+
+
+if __name__ == "__main__":
+    main()
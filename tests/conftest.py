@@ -1,7 +1,7 @@
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from app.main import app
-from app.db.session import engine
+from app.db.session import async_engine, engine
 from app.db.base import Base
 import pytest
 
@@ -10,6 +10,10 @@ import pytest
 # -------------------------
 @pytest.fixture(autouse=True)
 def reset_database():
+    # asyncpg connections are bound to the event loop of the test that
+    # opened them; every test gets a fresh loop, so start a fresh pool
+    async_engine.sync_engine.dispose(close=False)
+
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
 
@@ -0,0 +1,171 @@
+import gzip
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+import app.main
+from app.db.session import SessionLocal, engine
+from app.modules.audit.models import AuditLog
+from app.modules.audit.partitions import (
+    archive_expired_partitions,
+    create_month_partition,
+    list_month_partitions,
+    partition_name,
+)
+from app.modules.audit.writer import AuditLogWriter, AuditPolicy
+
+
+def make_writer(**overrides):
+    options = {"max_queue_size": 100, "batch_size": 50, "flush_interval": 0.1}
+    options.update(overrides)
+    return AuditLogWriter(**options)
+
+
+def audit_count():
+    db = SessionLocal()
+    try:
+        return db.query(AuditLog).count()
+    finally:
+        db.close()
+
+
+def test_writer_flushes_in_batches():
+    writer = make_writer(batch_size=2)
+
+    for i in range(3):
+        writer.submit({"user_id": uuid.uuid4(), "action": f"TEST {i}"})
+
+    assert writer.flush() == 2
+    assert audit_count() == 2
+
+    writer.stop()
+    assert audit_count() == 3
+
+
+def test_writer_drops_when_queue_is_full():
+    writer = make_writer(max_queue_size=1)
+
+    assert writer.submit({"user_id": uuid.uuid4(), "action": "FIRST"})
+    assert not writer.submit({"user_id": uuid.uuid4(), "action": "SECOND"})
+
+
+def test_policy_excludes_paths_and_samples_reads():
+    policy = AuditPolicy(excluded_paths=["/metrics"], sample_rate=0.0)
+
+    assert not policy.should_log("GET", "/metrics")
+    assert not policy.should_log("GET", "/consultations/my")
+    assert policy.should_log("POST", "/bookings/")
+
+
+@pytest.mark.asyncio
+async def test_middleware_does_not_write_inline(async_client, monkeypatch):
+    writer = make_writer()
+    monkeypatch.setattr(app.main, "audit_writer", writer)
+
+    await async_client.get(f"/availability/doctor/{uuid.uuid4()}")
+    await async_client.get("/metrics")
+
+    assert audit_count() == 0
+
+    writer.stop()
+    assert audit_count() == 1
+
+
+def seed_logs(count, **fields):
+    writer = make_writer()
+    for i in range(count):
+        writer.submit({"user_id": uuid.uuid4(), "action": f"ACTION {i % 2}", **fields})
+    writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_audit_keyset_pagination(async_client):
+    seed_logs(5)
+
+    seen = []
+    cursor = None
+
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = await async_client.get("/audit/", params=params)
+        assert response.status_code == 200
+
+        seen.extend(log["id"] for log in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_audit_filters_and_ndjson_export(async_client):
+    seed_logs(4, entity_type="consultation")
+
+    response = await async_client.get("/audit/", params={"action": "ACTION 1"})
+    assert [log["action"] for log in response.json()] == ["ACTION 1", "ACTION 1"]
+
+    export = await async_client.get("/audit/export", params={"entity_type": "consultation"})
+    assert export.headers["content-type"] == "application/x-ndjson"
+    assert len(export.text.splitlines()) == 4
+
+
+@pytest.mark.asyncio
+async def test_audit_rejects_invalid_cursor(async_client):
+    response = await async_client.get("/audit/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_current_month_partition_exists():
+    today = datetime.now(timezone.utc).date()
+
+    with engine.connect() as conn:
+        partitions = list_month_partitions(conn)
+
+    assert partitions[date(today.year, today.month, 1)] == partition_name(today)
+
+
+def test_retention_archives_expired_partitions(tmp_path):
+    old_month = date(2020, 1, 1)
+    seed_time = datetime(2020, 1, 15, tzinfo=timezone.utc)
+
+    with engine.begin() as conn:
+        create_month_partition(conn, old_month)
+
+    seed_logs(3, created_at=seed_time)
+
+    with engine.begin() as conn:
+        archived = archive_expired_partitions(conn, retain_months=12, archive_dir=str(tmp_path))
+
+    assert [path.rsplit("/", 1)[-1] for path in archived] == ["audit_logs_y2020m01.csv.gz"]
+
+    with gzip.open(archived[0], "rt") as archive:
+        assert len(archive.read().splitlines()) == 4  # header + rows
+
+    with engine.connect() as conn:
+        assert old_month not in list_month_partitions(conn)
+
+    assert audit_count() == 0
+
+
+def test_time_range_query_prunes_partitions():
+    today = datetime.now(timezone.utc)
+
+    with engine.connect() as conn:
+        plan = conn.execute(
+            text(
+                "EXPLAIN SELECT * FROM audit_logs "
+                "WHERE created_at >= :date_from AND created_at <= :date_to"
+            ),
+            {"date_from": today.replace(day=1, hour=0), "date_to": today},
+        ).scalars().all()
+
+    scanned = " ".join(plan)
+    assert partition_name(today.date()) in scanned
+    assert "audit_logs_default" not in scanned
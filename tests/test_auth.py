@@ -1,4 +1,14 @@
 import pytest
+from prometheus_client import REGISTRY
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.cache import TTLCache
+from app.core.security import PasswordHasher, pwd_context
+from app.modules.auth.principal import principal_cache
+from app.db.session import SessionLocal
+from app.modules.users.models import User
 
 
 @pytest.mark.asyncio
@@ -18,4 +28,164 @@ async def test_user_signup_and_login(async_client):
     })
 
     assert login_response.status_code == 200
-    assert "access_token" in login_response.json()
\ No newline at end of file
+    assert "access_token" in login_response.json()
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def cache_hits():
+    return REGISTRY.get_sample_value(
+        "principal_cache_requests_total", {"result": "hit"}
+    ) or 0
+
+
+@pytest.mark.asyncio
+async def test_principal_is_served_from_cache(async_client, patient_token):
+    await async_client.get("/users/me", headers=auth(patient_token))
+    hits = cache_hits()
+
+    response = await async_client.get("/users/me", headers=auth(patient_token))
+
+    assert response.status_code == 200
+    assert cache_hits() == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_deactivation_rejects_cached_principal(
+    async_client,
+    admin_token,
+    patient_token
+):
+    me = await async_client.get("/users/me", headers=auth(patient_token))
+    assert me.status_code == 200
+
+    update = await async_client.patch(
+        f"/admin/users/{me.json()['id']}",
+        json={"is_active": False},
+        headers=auth(admin_token)
+    )
+    assert update.status_code == 200
+
+    # both the DB-backed and the claims-only paths reject the old token
+    for path in ("/users/me", "/consultations/my"):
+        response = await async_client.get(path, headers=auth(patient_token))
+        assert response.status_code == 401
+
+    login = await async_client.post("/auth/login", json={
+        "email": "patient@test.com",
+        "password": "password"
+    })
+    assert login.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_role_change_revokes_outstanding_tokens(
+    async_client,
+    admin_token,
+    patient_token
+):
+    me = await async_client.get("/users/me", headers=auth(patient_token))
+
+    await async_client.patch(
+        f"/admin/users/{me.json()['id']}",
+        json={"role": "admin"},
+        headers=auth(admin_token)
+    )
+
+    stale = await async_client.get("/admin/analytics", headers=auth(patient_token))
+    assert stale.status_code == 401
+
+    login = await async_client.post("/auth/login", json={
+        "email": "patient@test.com",
+        "password": "password"
+    })
+    fresh = await async_client.get(
+        "/admin/analytics",
+        headers=auth(login.json()["access_token"])
+    )
+    assert fresh.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_read_only_endpoints_authorize_from_claims(
+    async_client,
+    patient_token
+):
+    misses = REGISTRY.get_sample_value(
+        "principal_cache_requests_total", {"result": "miss"}
+    ) or 0
+    principal_cache.clear()
+
+    response = await async_client.get("/consultations/my", headers=auth(patient_token))
+
+    assert response.status_code == 200
+    assert REGISTRY.get_sample_value(
+        "principal_cache_requests_total", {"result": "miss"}
+    ) == misses
+
+
+@pytest.mark.asyncio
+async def test_revoke_tokens_endpoint(async_client, admin_token, patient_token):
+    me = await async_client.get("/users/me", headers=auth(patient_token))
+
+    revoke = await async_client.post(
+        f"/admin/users/{me.json()['id']}/revoke-tokens",
+        headers=auth(admin_token)
+    )
+    assert revoke.status_code == 200
+
+    response = await async_client.get("/prescriptions/my", headers=auth(patient_token))
+    assert response.status_code == 401
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = TTLCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 11
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_password_pool_rejects_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=1, max_pending=0)
+
+    with pytest.raises(HTTPException) as exc:
+        await hasher.hash("password")
+
+    assert exc.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(async_client):
+    legacy_context = CryptContext(schemes=["bcrypt_sha256"], bcrypt_sha256__rounds=4)
+
+    db = SessionLocal()
+    db.add(User(
+        email="legacy@test.com",
+        password_hash=legacy_context.hash("password"),
+        role="patient",
+    ))
+    db.commit()
+
+    response = await async_client.post("/auth/login", json={
+        "email": "legacy@test.com",
+        "password": "password"
+    })
+    assert response.status_code == 200
+
+    db.expire_all()
+    user = db.query(User).filter(User.email == "legacy@test.com").first()
+    db.close()
+
+    assert not pwd_context.needs_update(user.password_hash)
+    assert pwd_context.verify("password", user.password_hash)
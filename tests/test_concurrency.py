@@ -1,5 +1,13 @@
 import asyncio
+import threading
+
 import pytest
+from sqlalchemy import text
+
+from app.api.deps import run_db
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.modules.bookings.services import LOCK_STRATEGIES
 
 @pytest.mark.asyncio
 async def test_double_booking_prevention(async_client, slot_id, patient_token_1, patient_token_2):
@@ -22,4 +30,86 @@ async def test_double_booking_prevention(async_client, slot_id, patient_token_1,
     status_codes = [r.status_code for r in results]
 
     assert 201 in status_codes
-    assert 409 in status_codes  # conflict
\ No newline at end of file
+    assert 409 in status_codes  # conflict
+
+@pytest.mark.asyncio
+async def test_concurrent_overlapping_slots(async_client, doctor_token):
+
+    async def create(minute):
+        return await async_client.post(
+            "/availability/",
+            json={
+                "start_time": f"2026-03-01T10:{minute:02d}:00Z",
+                "end_time": f"2026-03-01T10:{minute + 30:02d}:00Z"
+            },
+            headers={"Authorization": f"Bearer {doctor_token}"}
+        )
+
+    results = await asyncio.gather(*(create(minute) for minute in range(0, 20, 2)))
+
+    status_codes = [r.status_code for r in results]
+
+    assert status_codes.count(200) == 1
+    assert status_codes.count(400) == len(results) - 1
+
+
+@pytest.mark.asyncio
+async def test_async_session_services_stay_on_event_loop():
+    loop_thread = threading.get_ident()
+
+    def service(db):
+        return threading.get_ident(), db.execute(text("SELECT 1")).scalar()
+
+    async with AsyncSessionLocal() as db:
+        thread, value = await run_db(db, service)
+
+    assert value == 1
+    assert thread == loop_thread  # no threadpool hop
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", LOCK_STRATEGIES)
+async def test_double_booking_prevention_per_lock_strategy(
+    async_client, slot_id, patient_token_1, patient_token_2, strategy, monkeypatch
+):
+    monkeypatch.setattr(settings, "booking_lock_strategy", strategy)
+
+    async def book(token):
+        return await async_client.post(
+            "/bookings/",
+            json={"slot_id": slot_id},
+            headers={"Authorization": f"Bearer {token}", "idempotency-key": token}
+        )
+
+    results = await asyncio.gather(book(patient_token_1), book(patient_token_2))
+
+    assert sorted(r.status_code for r in results) == [201, 409]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy, hold", [
+    ("nowait", "SELECT 1 FROM availability_slots WHERE id = :slot_id FOR UPDATE"),
+    ("advisory", "SELECT pg_advisory_xact_lock(hashtextextended('slot:' || :slot_id, 0))"),
+])
+async def test_fail_fast_strategies_do_not_wait(
+    async_client, slot_id, patient_token, strategy, hold, monkeypatch
+):
+    monkeypatch.setattr(settings, "booking_lock_strategy", strategy)
+
+    holder = SessionLocal()
+    holder.execute(text(hold), {"slot_id": slot_id})
+
+    try:
+        response = await asyncio.wait_for(
+            async_client.post(
+                "/bookings/",
+                json={"slot_id": slot_id},
+                headers={"Authorization": f"Bearer {patient_token}", "idempotency-key": "hot"}
+            ),
+            timeout=5,
+        )
+    finally:
+        holder.rollback()
+        holder.close()
+
+    assert response.status_code == 409
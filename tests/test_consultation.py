@@ -24,4 +24,51 @@ async def test_invalid_transition(
         headers={"Authorization": f"Bearer {doctor_token}"}
     )
 
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_search_cursor_pagination(async_client, doctor_token, patient_token):
+    for hour in range(9, 14):
+        slot = await async_client.post(
+            "/availability/",
+            json={
+                "start_time": f"2026-03-01T{hour:02d}:00:00Z",
+                "end_time": f"2026-03-01T{hour:02d}:30:00Z"
+            },
+            headers={"Authorization": f"Bearer {doctor_token}"}
+        )
+        await async_client.post(
+            "/bookings/",
+            json={"slot_id": slot.json()["id"]},
+            headers={
+                "Authorization": f"Bearer {patient_token}",
+                "idempotency-key": f"search-{hour}"
+            }
+        )
+
+    headers = {"Authorization": f"Bearer {patient_token}"}
+
+    offset_ids = [
+        c["id"]
+        for page in (1, 2, 3)
+        for c in (await async_client.get(
+            "/consultations/search", params={"page": page, "limit": 2}, headers=headers
+        )).json()
+    ]
+
+    cursor_ids, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await async_client.get("/consultations/search", params=params, headers=headers)
+        cursor_ids += [c["id"] for c in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(cursor_ids) == 5
+    assert cursor_ids == offset_ids
+
+    response = await async_client.get(
+        "/consultations/search", params={"cursor": "garbage"}, headers=headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,91 @@
+import pytest
+
+from app.core.rate_limiter import MemoryRateLimitStore, RateLimit, RateLimiter, limiter
+
+
+def test_sliding_window_weights_previous_window():
+    now = [0.0]
+    store = MemoryRateLimitStore(clock=lambda: now[0])
+
+    assert all(store.acquire("k", 4, 60) for _ in range(4))
+    assert not store.acquire("k", 4, 60)
+
+    # halfway into the next window half of the old hits still count
+    now[0] = 90.0
+    assert store.acquire("k", 4, 60)
+    assert store.acquire("k", 4, 60)
+    assert not store.acquire("k", 4, 60)
+
+
+def test_workers_sharing_a_store_enforce_one_limit():
+    store = MemoryRateLimitStore()
+    policies = {"bookings": "30/minute"}
+    workers = [RateLimiter(store, policies), RateLimiter(store, policies)]
+    rate = RateLimit.parse("30/minute")
+
+    allowed = sum(
+        workers[i % 2].hit("bookings:user:1", rate) for i in range(100)
+    )
+
+    assert allowed == 30
+
+
+def test_local_bucket_avoids_store_round_trips():
+    class CountingStore(MemoryRateLimitStore):
+        calls = 0
+
+        def acquire(self, *args, **kwargs):
+            CountingStore.calls += 1
+            return super().acquire(*args, **kwargs)
+
+    worker = RateLimiter(CountingStore(), {"bookings": "100/minute"})
+    rate = RateLimit.parse("100/minute")
+
+    assert all(worker.hit("bookings:user:1", rate) for _ in range(30))
+    assert CountingStore.calls == 3
+
+
+@pytest.fixture
+def enabled_limiter(monkeypatch):
+    monkeypatch.setattr(limiter, "store", MemoryRateLimitStore())
+    monkeypatch.setattr(limiter, "enabled", True)
+    limiter.reset()
+    yield limiter
+    limiter.reset()
+
+
+@pytest.mark.asyncio
+async def test_login_is_limited_per_client(async_client, enabled_limiter):
+    credentials = {"email": "nobody@test.com", "password": "wrong"}
+
+    statuses = [
+        (await async_client.post("/auth/login", json=credentials)).status_code
+        for _ in range(6)
+    ]
+
+    assert statuses[:5] == [401] * 5
+    assert statuses[5] == 429
+
+
+@pytest.mark.asyncio
+async def test_bookings_are_limited_per_user(
+    async_client,
+    patient_token_1,
+    patient_token_2,
+    enabled_limiter,
+    monkeypatch
+):
+    monkeypatch.setitem(limiter.policies, "bookings", RateLimit.parse("2/minute"))
+
+    async def book(token, key):
+        return await async_client.post(
+            "/bookings/",
+            json={"slot_id": "00000000-0000-0000-0000-000000000000"},
+            headers={"Authorization": f"Bearer {token}", "idempotency-key": key},
+        )
+
+    first_user = [(await book(patient_token_1, f"a{i}")).status_code for i in range(3)]
+    second_user = (await book(patient_token_2, "b0")).status_code
+
+    assert first_user == [404, 404, 429]
+    assert second_user == 404